@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.nested_reposts import build_repost_lists
+
+
+def make_inputs(num_originals, num_reposts, seed=0):
+    rng = np.random.default_rng(seed)
+    post_ids = pd.Series([str(10**9 + i) for i in range(num_originals)])
+    parents = rng.integers(0, int(num_originals * 1.1), size=num_reposts)  # ~10% orphans
+    reposts = pd.DataFrame({
+        "post_id": [str(10**9 + p) for p in parents],
+        "repost_text": [f"repost text {i}" for i in range(num_reposts)],
+        "label": rng.choice(["rumor", "nonrumor"], size=num_reposts),
+    })
+    return post_ids, reposts
+
+
+def groupby_attach(post_ids, reposts):
+    # Previous approach from merge_datasets.main
+    reposts_grouped = (
+        reposts
+        .groupby("post_id")[["repost_text", "label"]]
+        .apply(lambda x: x.to_dict("records"))
+        .to_dict()
+    )
+    return post_ids.map(reposts_grouped).apply(lambda x: x if isinstance(x, list) else [])
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(num_originals=100_000, num_reposts=1_000_000):
+    post_ids, reposts = make_inputs(num_originals, num_reposts)
+
+    old, old_time = timed(groupby_attach, post_ids, reposts)
+    lists, join_time = timed(build_repost_lists, post_ids, reposts)
+    records, materialize_time = timed(lists.to_records)
+
+    assert list(old) == list(records)
+
+    print(f"{num_originals} originals, {num_reposts} reposts")
+    print(f"groupby/apply/to_dict:  {old_time:.2f}s")
+    print(f"sort + offsets join:    {join_time:.2f}s")
+    print(f"  + materialize records: {materialize_time:.2f}s")
+    print(f"speed-up (join only): {old_time / join_time:.1f}x, "
+          f"(join + materialize): {old_time / (join_time + materialize_time):.1f}x")
+
+
+if __name__ == '__main__':
+    main()
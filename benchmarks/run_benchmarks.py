@@ -0,0 +1,153 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import merge_datasets
+from benchmarks.synthetic_corpus import GENERATORS, generate_corpus
+from utils.io_helpers import load_mappings, write_jsonl
+from utils.nested_reposts import build_repost_lists
+from utils.dataset_registry import get_loader
+from utils.mapping_plan import compile_mappings
+
+def source_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(dirpath, name)) for name in filenames)
+    return total
+
+
+def run_pipeline(name, path, plan, out_dir, measure):
+    # The stages of merge_datasets.process_dataset plus output writing; measure
+    # (stage, rows_of, func, *args) runs each stage and returns its result
+    rows = len
+    reposts_df = None
+    entry = merge_datasets.DATASETS[name]
+    combined_loader = get_loader(entry, "combined_loader")
+    if combined_loader is not None:
+        df, reposts_df = measure("load", lambda result: len(result[0]) + len(result[1]), combined_loader, path)
+    else:
+        df = measure("load", rows, get_loader(entry, "loader"), path)
+
+    repost_loader = get_loader(entry, "repost_loader")
+    if reposts_df is None and repost_loader is not None:
+        reposts_df = measure("load_reposts", rows, repost_loader, path)
+
+    originals = measure("process_and_map", rows, merge_datasets.process_and_map, name, df, plan)
+    reposts = None
+    if reposts_df is not None:
+        reposts = measure("process_and_map_reposts", rows, merge_datasets.process_and_map_reposts,
+                          name, reposts_df, plan)
+
+    repost_lists = measure("attach_reposts", lambda result: result.total,
+                           build_repost_lists, originals["post_id"], reposts)
+
+    def write():
+        with open(os.path.join(out_dir, f"{name}.jsonl"), "wb") as f:
+            write_jsonl(originals, f, repost_lists)
+        return len(originals)
+
+    measure("write_jsonl", lambda result: result, write)
+
+
+def benchmark_dataset(name, path, plan, out_dir, measure_memory=True):
+    stages = {}
+
+    def timed(stage, rows_of, func, *args):
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        result = func(*args)
+        wall, cpu = time.perf_counter() - start_wall, time.process_time() - start_cpu
+        num_rows = rows_of(result)
+        stages[stage] = {
+            "wall_s": round(wall, 4),
+            "cpu_s": round(cpu, 4),
+            "rows": num_rows,
+            "rows_per_s": round(num_rows / wall, 1) if wall > 0 else None,
+        }
+        return result
+
+    def traced(stage, rows_of, func, *args):
+        # Separate pass so tracing overhead never shows up in the timings
+        tracemalloc.start()
+        try:
+            result = func(*args)
+            stages[stage]["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+        finally:
+            tracemalloc.stop()
+        return result
+
+    run_pipeline(name, path, plan, out_dir, timed)
+    if measure_memory:
+        run_pipeline(name, path, plan, out_dir, traced)
+
+    size = source_size(path)
+    total_wall = sum(stage["wall_s"] for stage in stages.values())
+    return {
+        "dataset": name,
+        "source_bytes": size,
+        "source_mb_per_s": round(size / 2**20 / total_wall, 2) if total_wall > 0 else None,
+        "total_wall_s": round(total_wall, 4),
+        "stages": stages,
+    }
+
+
+def print_report(results):
+    print(f"{'dataset':<20}{'stage':<26}{'wall s':>9}{'cpu s':>9}{'rows':>10}{'rows/s':>12}{'peak MB':>10}")
+    for result in results:
+        for stage, stats in result["stages"].items():
+            print(f"{result['dataset']:<20}{stage:<26}{stats['wall_s']:>9.3f}{stats['cpu_s']:>9.3f}"
+                  f"{stats['rows']:>10}{stats['rows_per_s'] or 0:>12.0f}{stats.get('peak_mb', float('nan')):>10.2f}")
+        print(f"{result['dataset']:<20}{'total':<26}{result['total_wall_s']:>9.3f}"
+              f"{'':>9}{'':>10}{'':>12}{'':>10}  ({result['source_mb_per_s']} MB/s of source)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time every pipeline stage on a synthetic (or given) corpus")
+    parser.add_argument("--corpus", help="existing corpus from synthetic_corpus.py; generated in a temp dir if omitted")
+    parser.add_argument("--scale", type=int, default=1000)
+    parser.add_argument("--reposts", type=int, default=10)
+    parser.add_argument("--datasets", nargs="*", choices=list(GENERATORS), default=None)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory pass")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    mappings = load_mappings(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                          "configs", "mappings.json"))
+    datasets = args.datasets or list(GENERATORS)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.corpus:
+            paths = {name: os.path.join(args.corpus, GENERATORS[name][0]) for name in datasets}
+            if "FbMultiLingMisinfo" in paths:
+                paths["FbMultiLingMisinfo"] = os.path.join(paths["FbMultiLingMisinfo"], "FbMultiLingMisinfo.csv")
+        else:
+            start = time.perf_counter()
+            paths = generate_corpus(os.path.join(tmp_dir, "corpus"), args.scale, args.reposts, datasets)
+            print(f"Generated synthetic corpus in {time.perf_counter() - start:.1f}s")
+
+        # Registry entries (loaders, language/domain/platform) with the corpus paths
+        merge_datasets.use_datasets(datasets, paths)
+        plans = compile_mappings(mappings, merge_datasets.DATASETS)
+
+        out_dir = os.path.join(tmp_dir, "output")
+        os.makedirs(out_dir, exist_ok=True)
+        results = [
+            benchmark_dataset(name, paths[name], plans[name], out_dir, not args.no_memory)
+            for name in datasets
+        ]
+
+    print_report(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"scale": args.scale, "reposts": args.reposts, "results": results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,331 @@
+import os
+import sys
+import json
+import random
+import argparse
+from datetime import datetime, timedelta, timezone
+
+# Synthetic fixtures that mirror the on-disk layout each loader expects, so
+# the pipeline can be exercised and timed without the real datasets.
+# scale is the number of source posts per dataset, reposts the replies per post.
+
+WORDS = ("breaking news police report confirmed fake rumour video photo city people "
+         "today storm fire attack official statement unverified source shared").split()
+ZH_WORDS = "突发 新闻 谣言 警方 辟谣 视频 图片 城市 今天 网友 转发 官方 消息 证实".split()
+TWITTER_TIME_FORMAT = "%a %b %d %H:%M:%S +0000 %Y"
+BASE_TIME = datetime(2014, 1, 1, tzinfo=timezone.utc)
+
+
+class _Ids:
+    def __init__(self, start=500000000000000000):
+        self.next_id = start
+
+    def __call__(self):
+        self.next_id += 1
+        return self.next_id
+
+
+def _write_json(path, obj):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False)
+
+
+def _sentence(rng, words=WORDS, low=6, high=20):
+    sep = "" if words is ZH_WORDS else " "
+    text = sep.join(rng.choice(words) for _ in range(rng.randint(low, high)))
+    if rng.random() < 0.5:
+        text += f" http://t.co/{rng.randint(10**6, 10**7)}"
+    return text + rng.choice(["", "!", "?!", "..."])
+
+
+def _time(rng):
+    return BASE_TIME + timedelta(seconds=rng.randint(0, 3 * 365 * 24 * 3600))
+
+
+def _tweet(rng, ids, parent_id=None, with_parent_str=False):
+    tweet_id = ids()
+    tweet = {
+        "id": tweet_id,
+        "id_str": str(tweet_id),
+        "text": _sentence(rng),
+        "created_at": _time(rng).strftime(TWITTER_TIME_FORMAT),
+        "retweet_count": rng.randint(0, 5000),
+        "favorite_count": rng.randint(0, 5000),
+        "lang": "en",
+        "user": {
+            "id": rng.randint(1, 10**9),
+            "name": f"user{rng.randint(1, 10**6)}",
+            "followers_count": rng.randint(0, 10**6),
+            "friends_count": rng.randint(0, 10**4),
+            "verified": rng.random() < 0.1,
+            "description": _sentence(rng),
+        },
+        "in_reply_to_status_id": parent_id,
+    }
+    if with_parent_str:
+        tweet["in_reply_to_status_id_str"] = None if parent_id is None else str(parent_id)
+    return tweet
+
+
+def _thread(rng, ids, thread_root, source_dir, reactions_dir, reposts, with_parent_str=False):
+    source = _tweet(rng, ids)
+    thread_path = os.path.join(thread_root, str(source["id"]))
+    _write_json(os.path.join(thread_path, source_dir, f"{source['id']}.json"), source)
+    for _ in range(reposts):
+        reply = _tweet(rng, ids, source["id"], with_parent_str)
+        _write_json(os.path.join(thread_path, reactions_dir, f"{reply['id']}.json"), reply)
+    return source["id_str"], thread_path
+
+
+def _split(scale, parts):
+    sizes = [scale // parts] * parts
+    for i in range(scale % parts):
+        sizes[i] += 1
+    return sizes
+
+
+def make_pheme5(root, scale, reposts, rng, ids, source_dir="source-tweet"):
+    for event, count in zip(["charliehebdo", "ferguson", "sydneysiege"], _split(scale, 3)):
+        for i in range(count):
+            label = "rumours" if i % 2 else "non-rumours"
+            _thread(rng, ids, os.path.join(root, event, label), source_dir, "reactions", reposts)
+
+
+def make_pheme_veracity(root, scale, reposts, rng, ids):
+    make_pheme5(root, scale, reposts, rng, ids, source_dir="source-tweets")
+
+
+def make_pheme9(root, scale, reposts, rng, ids):
+    for (lang, event), count in zip([("en", "ferguson"), ("en", "ottawashooting"), ("de", "germanwings-crash")],
+                                    _split(scale, 3)):
+        for _ in range(count):
+            _, thread_path = _thread(rng, ids, os.path.join(root, "threads", lang, event),
+                                     "source-tweets", "reactions", reposts)
+            _write_json(os.path.join(thread_path, "annotation.json"),
+                        {"is_rumour": rng.choice(["rumour", "nonrumour"]), "category": "synthetic"})
+
+
+def make_rumoureval17(root, scale, reposts, rng, ids):
+    labels = {}
+    for event, count in zip(["charliehebdo", "ferguson"], _split(scale, 2)):
+        for _ in range(count):
+            tweet_id, _ = _thread(rng, ids, os.path.join(root, "rumoureval-data", event), "source-tweet", "replies", reposts)
+            labels[tweet_id] = rng.choice(["true", "false", "unverified"])
+    items = list(labels.items())
+    _write_json(os.path.join(root, "traindev", "rumoureval-subtaskB-train.json"), dict(items[: len(items) * 4 // 5]))
+    _write_json(os.path.join(root, "traindev", "rumoureval-subtaskB-dev.json"), dict(items[len(items) * 4 // 5:]))
+
+
+def make_rumoureval19(root, scale, reposts, rng, ids):
+    labels = {}
+    for folder, count in zip(["twitter-english", "reddit-training-data", "reddit-dev-data"], _split(scale, 3)):
+        for _ in range(count):
+            tweet_id, _ = _thread(rng, ids, os.path.join(root, folder, "event"), "source-tweet", "replies",
+                                  reposts, with_parent_str=True)
+            labels[tweet_id] = rng.choice(["true", "false", "unverified"])
+    items = list(labels.items())
+    _write_json(os.path.join(root, "train-key.json"), {"subtaskbenglish": dict(items[: len(items) * 4 // 5])})
+    _write_json(os.path.join(root, "dev-key.json"), {"subtaskbenglish": dict(items[len(items) * 4 // 5:])})
+
+
+def make_ced(root, scale, reposts, rng, ids):
+    for i in range(scale):
+        microblog_id = str(ids())
+        _write_json(os.path.join(root, "original-microblog", f"{microblog_id}.json"), {
+            "text": _sentence(rng, ZH_WORDS),
+            "time": int(_time(rng).timestamp()),
+            "reposts": rng.randint(0, 5000),
+            "likes": rng.randint(0, 5000),
+            "user": {
+                "followers": rng.randint(0, 10**6),
+                "friends": rng.randint(0, 10**4),
+                "verified": rng.random() < 0.2,
+            },
+        })
+        repost_dir = "rumor-repost" if i % 2 else "non-rumor-repost"
+        _write_json(os.path.join(root, repost_dir, f"{microblog_id}.json"), [
+            {"mid": str(ids()), "text": _sentence(rng, ZH_WORDS), "date": _time(rng).strftime("%Y-%m-%d %H:%M:%S")}
+            for _ in range(reposts)
+        ])
+
+
+def make_weibo_data(root, scale, reposts, rng, ids):
+    os.makedirs(root, exist_ok=True)
+    for file_name, count in zip(["train_rumor.txt", "train_nonrumor.txt", "test_rumor.txt", "test_nonrumor.txt"],
+                                _split(scale, 4)):
+        with open(os.path.join(root, file_name), "w", encoding="utf-8") as f:
+            for _ in range(count):
+                meta = [str(ids()), f"user{rng.randint(1, 10**6)}", "http://weibo.com/u", "", str(int(_time(rng).timestamp())),
+                        "0", str(rng.randint(0, 5000)), "0", str(rng.randint(0, 5000)), "0",
+                        str(rng.randint(0, 2)), str(rng.randint(0, 10**6)), str(rng.randint(0, 10**4)), "0", "0"]
+                f.write("|".join(meta) + "\n")
+                f.write(f"http://ww1.sinaimg.cn/{rng.randint(10**6, 10**7)}.jpg|null\n")
+                f.write(_sentence(rng, ZH_WORDS) + "\n")
+
+
+USER_FEATURE_COLUMNS = ["num_friends", "num_followers", "folfriend_ratio", "times_listed", "has_url", "is_verified", "num_tweets"]
+TWEET_FEATURE_COLUMNS = ["num_words", "text_length", "contains_questmark", "num_questmark",
+                         "contains_exclammark", "num_exclammark", "contains_happyemo", "contains_sademo",
+                         "contains_firstorderpron", "contains_secondorderpron", "contains_thirdorderpron",
+                         "num_uppercasechars", "num_possentiwords", "num_negsentiwords", "num_mentions",
+                         "num_hashtags", "num_URLs", "num_retweets"]
+
+
+def _user_feature_row(rng, tweet_id):
+    friends, followers = rng.randint(1, 10**4), rng.randint(0, 10**6)
+    return [tweet_id, friends, followers, round(followers / friends, 3), rng.randint(0, 500),
+            rng.choice(["true", "false"]), rng.choice(["true", "false"]), rng.randint(1, 10**5)]
+
+
+def _tweet_feature_row(rng, tweet_id):
+    return [tweet_id] + [rng.randint(0, 30) for _ in TWEET_FEATURE_COLUMNS[:-1]] + [rng.randint(0, 5000)]
+
+
+def _write_table(path, header, rows, sep):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        if header is not None:
+            f.write(sep.join(header) + "\n")
+        for row in rows:
+            f.write(sep.join(str(value) for value in row) + "\n")
+
+
+def _post_rows(rng, ids, count, labelled=True, username_before_image=False):
+    rows = []
+    for _ in range(count):
+        tweet_id = ids()
+        user_id, image_id, username = rng.randint(1, 10**9), f"img_{rng.randint(1, 500)}", f"user{rng.randint(1, 10**6)}"
+        row = [tweet_id, _sentence(rng).replace("\t", " "), user_id]
+        row += [username, image_id] if username_before_image else [image_id, username]
+        row.append(_time(rng).strftime(TWITTER_TIME_FORMAT))
+        if labelled:
+            row.append(rng.choice(["fake", "real", "humor"]))
+        rows.append(row)
+    return rows
+
+
+def make_mediaeval15(root, scale, reposts, rng, ids):
+    tweet_header = ["tweetId", "tweetText", "userId", "imageId(s)", "username", "timestamp", "label"]
+    for split, count in zip(["dev", "test"], _split(scale, 2)):
+        rows = _post_rows(rng, ids, count)
+        _write_table(os.path.join(root, f"tweets_{split}.txt"), tweet_header, rows, "\t")
+        user_rows = [_user_feature_row(rng, row[0]) for row in rows]
+        tweet_rows = [_tweet_feature_row(rng, row[0]) for row in rows]
+        if split == "dev":
+            _write_table(os.path.join(root, "user_features_dev.csv"),
+                         ["tweetId"] + USER_FEATURE_COLUMNS, user_rows, ", ")
+            _write_table(os.path.join(root, "tweet_features_dev.csv"),
+                         ["tweetId"] + TWEET_FEATURE_COLUMNS, tweet_rows, ", ")
+        else:
+            _write_table(os.path.join(root, "user_features_test.txt"),
+                         ["id"] + USER_FEATURE_COLUMNS, user_rows, ",")
+            _write_table(os.path.join(root, "tweet_features_test.txt"),
+                         ["id"] + TWEET_FEATURE_COLUMNS, tweet_rows, ",")
+
+
+def make_twitter(root, scale, reposts, rng, ids):
+    for split, count in zip(["devset", "testset"], _split(scale, 2)):
+        labelled = split == "devset"
+        rows = _post_rows(rng, ids, count, labelled=labelled, username_before_image=not labelled)
+        header = ["post_id", "post_text", "user_id", "image_id", "username", "timestamp", "label"] if labelled \
+            else ["post_id", "post_text", "user_id", "username", "image_id", "timestamp"]
+        _write_table(os.path.join(root, split, "posts.txt"), header, rows, "\t")
+        _write_table(os.path.join(root, split, "user_features.txt"), ["post_id"] + USER_FEATURE_COLUMNS,
+                     [_user_feature_row(rng, row[0]) for row in rows], ",")
+        _write_table(os.path.join(root, split, "post_features.txt"), ["post_id"] + TWEET_FEATURE_COLUMNS,
+                     [_tweet_feature_row(rng, row[0]) for row in rows], ",")
+
+
+def make_social_honeypot(root, scale, reposts, rng, ids):
+    for label_prefix, count in zip(["content_polluters", "legitimate_users"], _split(scale, 2)):
+        users = [rng.randint(1, 10**9) for _ in range(max(1, count // 10))]
+        _write_table(os.path.join(root, f"{label_prefix}.txt"), None, [
+            [user_id, "2009-01-01 00:00:00", "2010-01-01 00:00:00", rng.randint(0, 5000),
+             rng.randint(0, 5000), rng.randint(0, 5000), rng.randint(4, 15), rng.randint(0, 160)]
+            for user_id in users
+        ], "\t")
+        _write_table(os.path.join(root, f"{label_prefix}_tweets.txt"), None, [
+            [rng.choice(users), ids(), _sentence(rng).replace("\t", " "), _time(rng).strftime("%Y-%m-%d %H:%M:%S")]
+            for _ in range(count)
+        ], "\t")
+
+
+def make_weibo_rumor(root, scale, reposts, rng, ids):
+    os.makedirs(os.path.join(root, "Weibo"), exist_ok=True)
+    with open(os.path.join(root, "Weibo.txt"), "w", encoding="utf-8") as index:
+        for _ in range(scale):
+            event_id = ids()
+            posts = [{
+                "id": event_id,
+                "original_text": _sentence(rng, ZH_WORDS),
+                "text": _sentence(rng, ZH_WORDS),
+                "username": f"user{rng.randint(1, 10**6)}",
+                "followers_count": rng.randint(0, 10**6),
+                "friends_count": rng.randint(0, 10**4),
+                "verified": rng.random() < 0.2,
+                "reposts_count": reposts,
+                "favourites_count": rng.randint(0, 5000),
+                "t": int(_time(rng).timestamp()),
+            }]
+            for _ in range(reposts):
+                posts.append({"id": ids(), "parent": event_id, "text": _sentence(rng, ZH_WORDS),
+                              "username": f"user{rng.randint(1, 10**6)}", "t": int(_time(rng).timestamp())})
+            rng.shuffle(posts)
+            _write_json(os.path.join(root, "Weibo", f"{event_id}.json"), posts)
+            index.write(f"eid:{event_id}\tlabel:{rng.randint(0, 1)}\t" + " ".join(str(p["id"]) for p in posts) + "\n")
+
+
+def make_fb_multilingual(root, scale, reposts, rng, ids):
+    path = os.path.join(root, "FbMultiLingMisinfo.csv")
+    rows = [[ids(), _sentence(rng), _time(rng).strftime("%Y-%m-%d %H:%M:%S"), rng.randint(0, 1)]
+            for _ in range(scale)]
+    _write_table(path, ["id", "share_title", "timestamp_first_tweet", "tpfc_rating_encoding"], rows, ",")
+    return path
+
+
+GENERATORS = {
+    "CED": ("ced", make_ced),
+    "FbMultiLingMisinfo": ("fbmultilingmisinfo", make_fb_multilingual),
+    "MediaEval15": ("mediaeval2015", make_mediaeval15),
+    "Pheme5": ("pheme-rnr-dataset", make_pheme5),
+    "Pheme9": ("pheme-rumour-scheme-dataset", make_pheme9),
+    "Pheme-veracity": ("all-rnr-annotated-threads", make_pheme_veracity),
+    "RumorEval17": ("semeval2017-task8-dataset", make_rumoureval17),
+    "RumorEval19": ("rumoureval-2019-training-data", make_rumoureval19),
+    "Social-Honeypot": ("social_honeypot_icwsm_2011", make_social_honeypot),
+    "Twitter": ("twitter", make_twitter),
+    "Weibo-data": ("weibo-dataset", make_weibo_data),
+    "Weibo-Rumor": ("weibo-rumor", make_weibo_rumor),
+}
+
+
+def generate_corpus(output_dir, scale=1000, reposts=10, datasets=None, seed=0):
+    # Returns {dataset_name: path} in the form DATA_PATHS expects
+    paths = {}
+    for name in datasets or GENERATORS:
+        folder, generator = GENERATORS[name]
+        rng = random.Random(f"{seed}-{name}")
+        ids = _Ids(500000000000000000 + 10**12 * list(GENERATORS).index(name))
+        root = os.path.join(output_dir, folder)
+        path = generator(root, scale, reposts, rng, ids)
+        paths[name] = path or root
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic corpus in the layout of every supported dataset")
+    parser.add_argument("output_dir")
+    parser.add_argument("--scale", type=int, default=1000, help="source posts per dataset")
+    parser.add_argument("--reposts", type=int, default=10, help="reposts per source post")
+    parser.add_argument("--datasets", nargs="*", choices=list(GENERATORS), default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    paths = generate_corpus(args.output_dir, args.scale, args.reposts, args.datasets, args.seed)
+    json.dump(paths, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,222 +1,553 @@
 import os
 import pandas as pd
-from preprocessing.text_cleaner import clean_text, standardize_timestamp
-from utils.df_helpers import *
-from utils.repost_helpers import *
-from utils.io_helpers import load_dataset, save_dataset, load_mappings
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from preprocessing.text_cleaner import clean_text_series, standardize_timestamp_series
+from preprocessing.language_id import LANGUAGE_ID_ENV_VAR, set_language_id, language_id_enabled, detect_languages, clear_cache as clear_language_cache
+from utils.io_helpers import CSV_ENGINE_ENV_VAR, set_csv_engine, active_csv_engine, load_mappings, pack_frame, unpack_frame, open_output, jsonl_output_path, write_jsonl, write_json_array
+from utils.nested_reposts import build_repost_lists
+from utils.parquet_output import open_parquet_output
+from utils.arrow_output import open_arrow_output
+from utils.jsonl_index import JsonlIndexWriter, index_path_for
+from utils.stats_cube import StatsCubeWriter, stats_path_for
+from utils.build_cache import dataset_fingerprint, load_cached, store_cached
+from utils.json_decoder import BACKEND_ENV_VAR, set_json_backend, active_json_backend
+from utils.schema import UNIFIED_SCHEMA, REPOST_SCHEMA, enforce_schema, memory_usage, format_bytes
+from utils.run_report import RunReport, activate, stage, add_count
+from utils.parallel_reader import READ_WORKERS_ENV_VAR, set_read_workers, active_read_workers
+from utils.dedup import DedupIndex, PrecedenceBuffer, in_precedence_order
+from utils.shard_store import SOURCE_COLUMN, ShardStore, sort_merge_reposts
+from utils.mapping_plan import compile_mappings
+from utils.dataset_registry import DATASETS_ENV_VAR, REGISTRY_PATH, load_registry, select_datasets, active_datasets, data_paths, get_loader
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from tqdm import tqdm
 import traceback
+import argparse
+import json
+import time
 
-DATA_PATHS = {
-    #"CED" : [r"D:\text datasets\text datasets\CED_Dataset", "zh", "society,disasters,health,politics,science", "Weibo"],
-    #"FbMultiLingMisinfo": [r'D:\text datasets\text datasets\FbMultiLingMisinfo.csv', "en,it,de,es,fr,pt,id,nl,tl,el,af,hr,da", "politics", "Facebook"],
-    "MediaEval15": [r"D:\text+image\text+image\mediaeval2015", "en,es,id,fr,no,pt,it,nl,ar", "society,disasters,health,politics,science,technology,entertainment,publicsafety", "Twitter"],
-    #"Pheme5": [r'D:\text datasets\text datasets\phemernrdataset\pheme-rnr-dataset', "en","disaster,crime,publicsafety,religion", "Twitter"],
-    "Pheme9": [r'D:\text+image\text+image\pheme9\pheme-rumour-scheme-dataset', "en,de", "disaster,crime,publicsafety,religion", "Twitter"],
-    # "Pheme-veracity": [r'D:\text datasets\text datasets\PHEME_veracity\all-rnr-annotated-threads', "en", "disaster,crime,publicsafety,religion", "Twitter"],
-    # "RumorEval17": [r"D:\text datasets\text datasets\RumorEval17\semeval2017-task8-dataset", "en", "others", "Twitter"],
-    # "RumorEval19": [r"D:\text datasets\text datasets\rumoureval2019\rumoureval2019\rumoureval-2019-training-data\rumoureval-2019-training-data", "en", "others", "Twitter,Reddit"],
-    # "Social-Honeypot": [r'D:\text datasets\text datasets\Social-Honeypot\social_honeypot_icwsm_2011', "en,es,ms,pt", "spam,politics,jobs,social", "Twitter"],
-    # "Twitter": [r'D:\text+image\text+image\twitter', "en,es,id,fr,no,pt,it,nl,ar", "society,disasters,health,politics,science,technology,entertainment,publicsafety", "Twitter"],
-    #"Weibo-data": [r'D:\text+image\text+image\Weibo-dataset-main\Weibo-dataset-main', "zh", "society,disasters,health,politics,science,technology,entertainment,publicsafety", "Weibo"],
-    #"Weibo-Rumor": [r"D:\text datasets\text datasets\weibo rumor", "zh", "politics", "Weibo"],
-}
-
-# fill this dictionary for only special cases
-convert_to_df = {
-    "CED" : load_ced_original_posts,
-    "Social-Honeypot": load_social_honeypot_dataset,
-    "Weibo-data": load_weibo_dataset,
-    "MediaEval15": load_mediaeval15,
-    "Pheme5": load_pheme5_original,
-    "Pheme9": load_pheme9,
-    "Pheme-veracity": load_phemeveracity,
-    "RumorEval17": load_rumoureval17_dataset,
-    "RumorEval19": load_rumoureval2019_dataset,
-    "Twitter": load_twitter, 
-    "Weibo-Rumor": load_weibo_rumor_dataset
-}
-
-convert_to_reposts = {
-    "CED": load_ced_repost_posts,
-    "Pheme5": load_pheme5_reposts,
-    "Pheme9": load_pheme9_reposts,
-    "Pheme-veracity": load_phemeveracity_reposts,
-    "RumorEval17": load_rumoureval17_reposts,
-    "RumorEval19": load_rumoureval2019_reposts,
-    "Weibo-Rumor": load_weibo_rumor_reposts
-}
-
-def update_fields(dataset_name, df):
-    required_columns = [
-        "post_id", "text", "timestamp", "label", "username",
-        "follower_count", "friends_count", "is_verified",
-        "repost_count", "likes", "language", "domain", "platform"
-    ]
-    
-    # Check for missing columns and add them with default values
-    for col in required_columns:
-        if col not in df.columns:
-            # Set default values based on the column type
-            if col in ["username", "text", "timestamp", "is_verified"]:
-                df[col] = ""
-            else:
-                df[col] = 0
-    return df
-
-def update_reposts_fields(dataset_name, df):
-    required_columns = ["post_id", "repost_text", "label"]
-    
-    for col in required_columns:
-        if col not in df.columns:
-            if col in ["post_id", "repost_text"]:
-                df[col] = ""
-    return df
-
-def process_and_map_reposts(dataset_name, df, mapping):
-    repost_mapping = mapping.get("repost_mapping", {})
-
-    df = update_reposts_fields(dataset_name, df)
+# Datasets and their loaders come from configs/datasets.json ("enabled"
+# picks the default selection); loaders are imported only for datasets
+# that are built. DATA_PATHS is name -> [path, language, domain, platform].
+DATASETS = active_datasets()
+DATA_PATHS = data_paths(DATASETS)
 
-    df = df[[repost_mapping["post_id"], repost_mapping["repost_text"], repost_mapping["label"]]]
 
-    df = df.rename(columns={
-        repost_mapping["post_id"]: "post_id",
-        repost_mapping["repost_text"]: "repost_text",
-        repost_mapping["label"]: "label",
-    })
+def use_datasets(names=None, roots=None, registry_path=REGISTRY_PATH):
+    # Replaces the selection; exported so process-pool workers see it too
+    global DATASETS, DATA_PATHS
+    DATASETS = select_datasets(load_registry(registry_path), names, roots)
+    DATA_PATHS = data_paths(DATASETS)
+    os.environ[DATASETS_ENV_VAR] = json.dumps(DATASETS)
+    return list(DATASETS)
 
-    df["repost_text"] = df["repost_text"].astype(str).apply(clean_text)
+def process_and_map_reposts(dataset_name, df, plan):
+    with stage("repost_map", len(df)) as record:
+        df, copy_stats = plan.project_reposts(df)
 
-    return df[["post_id", "repost_text", "label"]]
+        df["repost_text"] = clean_text_series(df["repost_text"])
 
-def process_and_map(dataset_name, df, mapping):
-    column_mapping = mapping.get("column_mapping", {})
-    label_mapping = mapping.get("label_mapping", {})
+        df = enforce_schema(df, REPOST_SCHEMA)
+        record["rows_out"] = len(df)
+        record.update(copy_stats)
 
-    df = update_fields(dataset_name, df)
-
-    # Rename columns to standard names
-    df = df[[column_mapping["post_id"], column_mapping["text"], column_mapping["timestamp"], column_mapping["label"], column_mapping["username"], column_mapping["follower_count"], column_mapping["friends_count"], column_mapping["is_verified"], column_mapping["repost_count"], column_mapping["likes"]]].dropna()
-    
-    df = df.rename(columns={
-        column_mapping["post_id"]: "post_id",
-        column_mapping["text"]: "text",
-        column_mapping["timestamp"]: "timestamp",
-        column_mapping["label"]: "label",
-        column_mapping["username"]: "username",
-        column_mapping["follower_count"]: "follower_count",
-        column_mapping["friends_count"]: "friends_count",
-        column_mapping["is_verified"]: "is_verified",
-        column_mapping["repost_count"]: "repost_count",
-        column_mapping["likes"]: "likes"
-    })
-
-    # Map labels to standard labels
-    labels_to_keep = list(label_mapping.keys())
-    
-    if len(labels_to_keep) != 0:
+    return df
 
-        # Convert the labels to string
-        df['label'] = df['label'].astype(str)
-        df = df[df['label'].isin(labels_to_keep)]
-        df['label'] = df['label'].astype(str).str.strip().map(label_mapping)
+def process_and_map(dataset_name, df, plan):
+    # plan is the dataset's MappingPlan: select, rename, default-fill, dropna,
+    # label filter and mapping in one projection
+    with stage("map", len(df)) as record:
+        df, copy_stats = plan.project(df)
+        add_count("rows_dropped_dropna", copy_stats.pop("rows_dropped_dropna"))
+        add_count("rows_dropped_label", copy_stats.pop("rows_dropped_label"))
+        record["rows_out"] = len(df)
+        record.update(copy_stats)
 
     # Clean text fields
-    df["text"] = df["text"].astype(str).apply(clean_text)
-
-    df["is_verified"] = df["is_verified"].astype(bool)
-
-    df["post_id"] = df["post_id"].astype(str).str.strip()
+    with stage("clean", len(df)) as record:
+        df["text"] = clean_text_series(df["text"])
+        record["rows_out"] = len(df)
+
+    # Per-record language of the cleaned text, among the declared languages
+    # for Latin script; off, every row keeps the declared DATA_PATHS string
+    with stage("language", len(df)) as record:
+        if language_id_enabled():
+            df["language"], language_stats = detect_languages(df["text"], DATA_PATHS[dataset_name][1])
+            record.update(language_stats)
+        else:
+            df["language"] = DATA_PATHS[dataset_name][1]
+        record["rows_out"] = len(df)
 
     # Timestamp parsing
-    df["timestamp"] = df["timestamp"].apply(standardize_timestamp)
-
-    df["language"] = DATA_PATHS[dataset_name][1]
-    df["domain"] = DATA_PATHS[dataset_name][2]
-    df["platform"] = DATA_PATHS[dataset_name][3]
+    with stage("timestamp", len(df)) as record:
+        timestamps, timestamp_stats = standardize_timestamp_series(df["timestamp"], plan.timestamp_format)
+        df["timestamp"] = timestamps
+        record["rows_out"] = len(df)
+        record["unparsed"] = timestamp_stats["failed"]
+    print(f"{dataset_name}: {timestamp_stats['failed']} of {timestamp_stats['rows']} timestamps could not be parsed "
+          f"(format: {timestamp_stats['format']}, fallback rows: {timestamp_stats['fallback']})")
+
+    # Compact dtypes: categoricals, nullable downcast counts, real booleans
+    with stage("schema", len(df)) as record:
+        df["domain"] = DATA_PATHS[dataset_name][2]
+        df["platform"] = DATA_PATHS[dataset_name][3]
+
+        memory_before = memory_usage(df[list(UNIFIED_SCHEMA)])
+        df = enforce_schema(df, UNIFIED_SCHEMA)
+        record["rows_out"] = len(df)
+    print(f"{dataset_name}: originals memory {format_bytes(memory_before)} -> {format_bytes(memory_usage(df))}")
 
+    return df
 
-    return df[["post_id", "text", "timestamp", "label", "username", "follower_count", "friends_count", "is_verified", "repost_count", "likes", "language", "domain", "platform"]] 
 
 
+def build_dataset(dataset_name, path, plan):
 
-def main():
-    mappings = load_mappings("configs/mappings.json")
-    originals_list = []
-    reposts_list = []
+    reposts_df = None
+    reposts = None
 
+    entry = DATASETS[dataset_name]
 
-    def process_dataset(dataset_name, path):
-  
-        if dataset_name in convert_to_df.keys():
-            df = convert_to_df[dataset_name](path)
+    with stage("load") as record:
+        combined_loader = get_loader(entry, "combined_loader")
+        if combined_loader is not None:
+            # Originals and reposts from a single pass over the sources
+            df, reposts_df = combined_loader(path)
         else:
-            df = load_dataset(path)  
-        original_posts = process_and_map(dataset_name, df, mappings[dataset_name])
+            df = get_loader(entry, "loader")(path)
+        record["rows_out"] = len(df)
+    original_posts = process_and_map(dataset_name, df, plan)
+
+    repost_loader = get_loader(entry, "repost_loader")
+    if reposts_df is None and repost_loader is not None:
+        with stage("load_reposts") as record:
+            reposts_df = repost_loader(path)
+            record["rows_out"] = len(reposts_df)
+
+    if reposts_df is not None:
+        reposts = process_and_map_reposts(dataset_name, reposts_df, plan)
+
+    return original_posts , reposts 
+
+def process_dataset(dataset_name, path, plan, cache_dir=None, hash_contents=False, metrics=None):
+    # With a cache_dir, datasets whose sources, mapping, DATA_PATHS entry and
+    # code are unchanged are loaded from the previous run's output. Stage
+    # timings and counters go to metrics (a DatasetMetrics) when given.
+    with activate(metrics):
+        if cache_dir is None:
+            return build_dataset(dataset_name, path, plan)
+
+        with stage("cache_check"):
+            dataset_info = DATA_PATHS[dataset_name] + [language_id_enabled()]
+            fingerprint = dataset_fingerprint(dataset_name, path, plan.mapping, dataset_info, hash_contents)
+            cached = load_cached(cache_dir, dataset_name, fingerprint)
+        if cached is not None:
+            print(f"{dataset_name}: unchanged, loaded from cache")
+            if metrics is not None:
+                metrics.info["cached"] = True
+            return cached
+
+        original_posts, reposts = build_dataset(dataset_name, path, plan)
+        with stage("cache_store"):
+            store_cached(cache_dir, dataset_name, fingerprint, original_posts, reposts)
+        return original_posts, reposts
+
+def process_dataset_packed(dataset_name, path, plan, cache_dir=None, hash_contents=False, metrics=None):
+    # Process pool entry point: results cross the process boundary as
+    # Arrow IPC buffers instead of pickled object-heavy DataFrames. metrics
+    # is the worker's own copy, so it is sent back alongside them.
+    original_posts, reposts = process_dataset(dataset_name, path, plan, cache_dir, hash_contents, metrics)
+    return pack_frame(original_posts), pack_frame(reposts), metrics
+
+def run_datasets(plans, executor_mode="thread", max_workers=None, on_result=None, cache_dir=None, hash_contents=False,
+                 report=None):
+    # Results are handed to on_result(name, originals, reposts) as each dataset
+    # finishes; without a callback they are collected and returned. Per-stage
+    # metrics are collected into report (a RunReport) when given.
+    originals_list = []
+    reposts_list = []
 
-        reposts_df = None
-        reposts = None
-        
-        if dataset_name in convert_to_reposts.keys():
-            reposts_df = convert_to_reposts[dataset_name](path)
-            reposts = process_and_map_reposts(dataset_name, reposts_df, mappings[dataset_name])
-
-        return original_posts , reposts 
-    
-    # Use ThreadPoolExecutor to process datasets concurrently
-    with ThreadPoolExecutor(max_workers=25) as executor:
+    if executor_mode == "process":
+        # CPU-bound work, so one worker per core
+        max_workers = max_workers or min(len(DATA_PATHS), os.cpu_count() or 1)
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+        task = process_dataset_packed
+    elif executor_mode == "thread":
+        pool = ThreadPoolExecutor(max_workers=max_workers or 25)
+        task = process_dataset
+    else:
+        raise ValueError(f"Unsupported executor mode: {executor_mode}")
+
+    start = time.perf_counter()
+
+    # Process datasets concurrently
+    with pool as executor:
         futures = {
-            executor.submit(process_dataset, name, DATA_PATHS[name][0]): name
+            executor.submit(task, name, DATA_PATHS[name][0], plans[name], cache_dir, hash_contents,
+                            report.dataset(name) if report is not None else None): name
             for name in DATA_PATHS
         }
         
         # Show progress with tqdm
-        for future in tqdm(as_completed(futures), total=len(futures), desc="Processing datasets"):
+        for future in tqdm(as_completed(futures), total=len(futures), desc=f"Processing datasets ({executor_mode})"):
+            name = futures.pop(future)
             try:
-                originals, repost = future.result()
-                originals_list.append(originals)
-                reposts_list.append(repost)
+                if executor_mode == "process":
+                    originals, repost, metrics = future.result()
+                    originals, repost = unpack_frame(originals), unpack_frame(repost)
+                    if metrics is not None:
+                        report.add_dataset(metrics)
+                else:
+                    originals, repost = future.result()
+                if on_result is not None:
+                    on_result(name, originals, repost)
+                else:
+                    originals_list.append(originals)
+                    reposts_list.append(repost)
             except Exception as e:
-                name = futures[future]
                 print(f"Error processing {name}: {e}")
                 traceback.print_exc()
-
-    # Merge originals and reposts into a single JSON
+                if report is not None:
+                    report.dataset(name).info["error"] = repr(e)
+
+    elapsed = time.perf_counter() - start
+    return originals_list, reposts_list, elapsed
+
+def compare_executor_modes(plans, dataset_workers=None):
+    # Wall time of loading and processing every dataset in each mode, with
+    # the same work in both: no rebuild cache, no dedup or output writing
+    # (results are only collected), and a cold language cache
+    times = {}
+    for mode in ["thread", "process"]:
+        clear_language_cache()
+        _, _, times[mode] = run_datasets(plans, mode, dataset_workers)
+    return times
+
+def main(executor_mode="thread", compare_modes=False, output_format="jsonl", compression=None,
+         use_cache=True, hash_contents=False, json_backend=None, dataset_workers=None, read_workers=None,
+         csv_engine=None, dedup=True, dedup_precedence=None, shards=None, datasets=None, roots=None,
+         registry_path=None, language_id=True, stats=True):
+    # output_format "jsonl" streams one record per line as each dataset finishes
+    # (uncompressed, with a <output>.idx offset index for utils/jsonl_index.py),
+    # "parquet" writes one platform/dataset partition per dataset with nested
+    # reposts, "arrow" appends each dataset to one uncompressed Arrow IPC file
+    # for memory-mapped reading (utils/arrow_reader.py), and "json" keeps the
+    # previous single final_dataset.json array (built in memory). With dedup,
+    # a post found in several datasets is only written for the first of them
+    # in dedup_precedence (default: DATA_PATHS order), and datasets are written
+    # in that order. shards=N builds the "json" output out of core: datasets
+    # are spilled to N post_id-hash shards under processed_data/shards and
+    # merged one shard at a time, so records come out grouped by shard.
+    # datasets, roots ({name: path}) and registry_path replace the default
+    # selection from configs/datasets.json. language_id=False keeps each
+    # dataset's declared language string instead of detecting it per record.
+    # With stats, counts, histograms and quantile sketches per dataset, label
+    # and platform are gathered as datasets are written and saved next to
+    # the output as stats_cube.arrow (read with utils/stats_cube.py).
+    if datasets is not None or roots is not None or registry_path is not None:
+        use_datasets(datasets, roots, registry_path or REGISTRY_PATH)
+
+    # Every selected dataset's mapping is checked before any dataset is loaded
+    plans = compile_mappings(load_mappings("configs/mappings.json"), DATASETS)
     os.makedirs("processed_data", exist_ok=True)
 
-    all_originals = pd.concat(originals_list, ignore_index=True)
-    all_reposts = pd.concat(
-        [r for r in reposts_list if r is not None],
-        ignore_index=True
-    )
-
-    reposts_grouped = (
-        all_reposts
-        .groupby("post_id")[["repost_text", "label"]]
-        .apply(lambda x: x.to_dict("records"))
-        .to_dict()
-    )
-
-    all_originals["reposts"] = (
-        all_originals["post_id"]
-        .map(reposts_grouped)
-        .apply(lambda x: x if isinstance(x, list) else [])
-    )
-
-    all_originals.to_json(
-        "processed_data/final_dataset.json",
-        orient="records",
-        force_ascii=False,
-        indent=2
-    )
-    print(f"Merged Social Media dataset saved with {len(all_originals)} records and reposts are {len(all_reposts)}")
-
-    #save_dataset(all_originals, "processed_data/all_originals.parquet")
-    #save_dataset(all_reposts, "processed_data/all_reposts.parquet")
-    #print(f"Merged Social Media dataset saved with {len(all_originals)} records and reposts are {len(all_reposts)}")
-
-# Run the main function if this script is executed
+    if json_backend is not None:
+        # Also exported so process-pool workers decode with the same backend
+        os.environ[BACKEND_ENV_VAR] = set_json_backend(json_backend)
+
+    if csv_engine is not None:
+        # "pyarrow" reads the MediaEval15/Twitter tables with the Arrow CSV reader
+        os.environ[CSV_ENGINE_ENV_VAR] = set_csv_engine(csv_engine)
+
+    # Also exported so process-pool workers make the same choice
+    os.environ[LANGUAGE_ID_ENV_VAR] = "1" if set_language_id(language_id) else "0"
+
+    if read_workers is not None:
+        # Size of the pool the loaders read their files on (one per process),
+        # separate from the dataset-level pool sized by dataset_workers
+        os.environ[READ_WORKERS_ENV_VAR] = str(set_read_workers(read_workers))
+
+    # Per-dataset rebuild cache; hash_contents also hashes every source file
+    # instead of trusting sizes and modification times
+    cache = {"cache_dir": "processed_data/cache" if use_cache else None, "hash_contents": hash_contents}
+
+    totals = {"records": 0, "reposts": 0}
+
+    # Per-dataset, per-stage timings and counters, written next to the output
+    report = RunReport(executor_mode=executor_mode, output_format=output_format, compression=compression,
+                       json_backend=active_json_backend(), cache=use_cache, dataset_workers=dataset_workers,
+                       read_workers=active_read_workers(), csv_engine=active_csv_engine(),
+                       language_id=language_id_enabled())
+
+    # Datasets missing from dedup_precedence follow it in DATA_PATHS order
+    precedence = [name for name in (dedup_precedence or []) if name in DATA_PATHS]
+    precedence += [name for name in DATA_PATHS if name not in precedence]
+    dedup_index = DedupIndex() if dedup else None
+    cube = StatsCubeWriter() if stats else None
+
+    def deduplicate(name, originals, reposts):
+        if dedup_index is not None:
+            with activate(report.dataset(name)), stage("dedup", len(originals)) as record:
+                rows_before = len(originals)
+                originals, reposts = dedup_index.apply(name, originals, reposts)
+                add_count("rows_dropped_duplicate", rows_before - len(originals))
+                record["rows_out"] = len(originals)
+        return originals, reposts
+
+    def add_stats(name, originals, repost_lists):
+        # The cube is fed the reposts attached to each record in the output
+        # (shard mode feeds it per shard), so it sees exactly what is written
+        if cube is not None:
+            with activate(report.dataset(name)), stage("stats", len(originals)) as record:
+                cube.add(name, originals, repost_lists)
+                record["rows_out"] = len(originals)
+
+    def merge_reposts(name, originals, reposts):
+        with activate(report.dataset(name)), stage("merge", len(originals)) as record:
+            repost_lists = build_repost_lists(originals["post_id"], reposts)
+            record["rows_out"] = len(originals)
+            record["reposts_attached"] = repost_lists.total
+        return repost_lists
+
+    if output_format == "jsonl":
+        output_path = jsonl_output_path("processed_data/final_dataset.jsonl", compression)
+        # Byte offsets only make sense in an uncompressed file
+        index = JsonlIndexWriter() if compression is None else None
+        with open_output(output_path, compression) as out:
+
+            def write_result(name, originals, reposts):
+                originals, reposts = deduplicate(name, originals, reposts)
+                repost_lists = merge_reposts(name, originals, reposts)
+                add_stats(name, originals, repost_lists)
+                with activate(report.dataset(name)), stage("write", len(originals)) as record:
+                    line_lengths = write_jsonl(originals, out, repost_lists)
+                    if index is not None:
+                        index.add(name, originals["post_id"], line_lengths)
+                    record["rows_out"] = len(originals)
+                totals["records"] += len(originals)
+                totals["reposts"] += 0 if reposts is None else len(reposts)
+
+            on_result = PrecedenceBuffer(precedence, write_result) if dedup else write_result
+            _, _, elapsed = run_datasets(plans, executor_mode, dataset_workers, on_result, report=report, **cache)
+            if dedup:
+                on_result.finish()
+
+        if index is not None:
+            # Sidecar for random access by record number or (dataset, post_id)
+            with activate(report.dataset("all")), stage("index", totals["records"]) as record:
+                record["rows_out"] = index.write(index_path_for(output_path))
+            report.info["index_path"] = index_path_for(output_path)
+
+    elif output_format == "parquet":
+        output_path = "processed_data/final_dataset_parquet"
+        # Partitions go to a fresh directory swapped in at the end, so the
+        # dataset holds only this run's datasets
+        with open_parquet_output(output_path) as write_partition:
+
+            def write_result(name, originals, reposts):
+                originals, reposts = deduplicate(name, originals, reposts)
+                repost_lists = merge_reposts(name, originals, reposts)
+                add_stats(name, originals, repost_lists)
+                with activate(report.dataset(name)), stage("write", len(originals)) as record:
+                    record["rows_out"] = write_partition(originals, repost_lists, name)
+                totals["records"] += record["rows_out"]
+                totals["reposts"] += 0 if reposts is None else len(reposts)
+
+            on_result = PrecedenceBuffer(precedence, write_result) if dedup else write_result
+            _, _, elapsed = run_datasets(plans, executor_mode, dataset_workers, on_result, report=report, **cache)
+            if dedup:
+                on_result.finish()
+
+    elif output_format == "arrow":
+        output_path = "processed_data/final_dataset.arrow"
+        with open_arrow_output(output_path) as write_arrow:
+
+            def write_result(name, originals, reposts):
+                originals, reposts = deduplicate(name, originals, reposts)
+                repost_lists = merge_reposts(name, originals, reposts)
+                add_stats(name, originals, repost_lists)
+                with activate(report.dataset(name)), stage("write", len(originals)) as record:
+                    record["rows_out"] = write_arrow(originals, repost_lists, name)
+                totals["records"] += record["rows_out"]
+                totals["reposts"] += 0 if reposts is None else len(reposts)
+
+            on_result = PrecedenceBuffer(precedence, write_result) if dedup else write_result
+            _, _, elapsed = run_datasets(plans, executor_mode, dataset_workers, on_result, report=report, **cache)
+            if dedup:
+                on_result.finish()
+
+    elif output_format == "json" and shards is not None:
+        output_path = "processed_data/final_dataset.json"
+        store = ShardStore("processed_data/shards", int(shards))
+
+        # Results are spilled as they arrive, tagged with their dataset, so
+        # memory stays bounded by one dataset; precedence order and dedup are
+        # applied shard by shard at merge time (records with the same key
+        # share a shard)
+        def spill_result(name, originals, reposts):
+            with activate(report.dataset(name)), stage("spill", len(originals)) as record:
+                store.add(name, originals, reposts)
+                record["rows_out"] = len(originals)
+            # Reposts without a post_id are not spilled but still counted
+            totals["reposts"] += 0 if reposts is None else int(reposts["post_id"].isna().sum())
+
+        _, _, elapsed = run_datasets(plans, executor_mode, dataset_workers, spill_result, report=report, **cache)
+
+        def merged_shards(record):
+            # Only one shard's originals and reposts are in memory at a time
+            for _, originals, reposts in store.iter_shards():
+                if dedup_index is not None:
+                    originals, reposts, dropped = dedup_index.apply_shard(originals, reposts, precedence, SOURCE_COLUMN)
+                    for name, count in dropped.items():
+                        report.dataset(name).add("rows_dropped_duplicate", count)
+                else:
+                    originals = in_precedence_order(originals, precedence, SOURCE_COLUMN)
+                    reposts = in_precedence_order(reposts, precedence, SOURCE_COLUMN)
+                sources = originals.pop(SOURCE_COLUMN)
+                repost_lists = sort_merge_reposts(originals["post_id"], reposts)
+                if cube is not None:
+                    for name, rows in sources.groupby(sources, sort=False).indices.items():
+                        cube.add(name, originals.take(rows), repost_lists.take(rows))
+                record["reposts_attached"] += repost_lists.total
+                record["largest_shard"] = max(record["largest_shard"], len(originals))
+                totals["records"] += len(originals)
+                totals["reposts"] += 0 if reposts is None else len(reposts)
+                yield originals, repost_lists
+
+        # Merge and write interleave shard by shard, so they are one stage
+        with activate(report.dataset("all")), stage("merge") as record:
+            record.update(shards=store.num_shards, spilled_bytes=store.bytes_written,
+                          reposts_attached=0, largest_shard=0)
+            with open(output_path, "w", encoding="utf-8") as out:
+                write_json_array(merged_shards(record), out)
+            record["rows_out"] = totals["records"]
+        store.cleanup()
+
+    elif output_format == "json":
+        output_path = "processed_data/final_dataset.json"
+        results = {}
+
+        def collect_result(name, originals, reposts):
+            results[name] = deduplicate(name, originals, reposts)
+
+        on_result = PrecedenceBuffer(precedence, collect_result)
+        _, _, elapsed = run_datasets(plans, executor_mode, dataset_workers, on_result, report=report, **cache)
+        on_result.finish()
+        originals_list = [originals for originals, _ in results.values()]
+        reposts_list = [reposts for _, reposts in results.values()]
+
+        # Merge originals and reposts into a single JSON; the merge and write
+        # cover every dataset at once, so they are reported under "all"
+        with activate(report.dataset("all")):
+            with stage("merge", sum(len(df) for df in originals_list)) as record:
+                all_originals = pd.concat(originals_list, ignore_index=True)
+                reposts_list = [r for r in reposts_list if r is not None]
+                all_reposts = pd.concat(reposts_list, ignore_index=True) if reposts_list else None
+
+                # Reposts are only materialized as lists of dicts for the final write
+                repost_lists = build_repost_lists(all_originals["post_id"], all_reposts)
+                all_originals["reposts"] = repost_lists.to_records()
+                record["rows_out"] = len(all_originals)
+
+            # Reposts attach across datasets here, so the cube is fed only now
+            start = 0
+            for name, originals in zip(results, originals_list):
+                add_stats(name, originals, repost_lists.slice(start, start + len(originals)))
+                start += len(originals)
+
+            with stage("write", len(all_originals)) as record:
+                all_originals.to_json(
+                    output_path,
+                    orient="records",
+                    force_ascii=False,
+                    indent=2
+                )
+                record["rows_out"] = len(all_originals)
+        totals["records"] = len(all_originals)
+        totals["reposts"] = 0 if all_reposts is None else len(all_reposts)
+    else:
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+    if cube is not None:
+        with activate(report.dataset("all")), stage("stats") as record:
+            record["rows_out"] = cube.write(stats_path_for(output_path))
+        report.info["stats_path"] = stats_path_for(output_path)
+
+    print(f"Processed {len(DATA_PATHS)} datasets in {elapsed:.2f}s using {executor_mode} mode "
+          f"(JSON backend: {active_json_backend()}, read workers: {active_read_workers()})")
+
+    if compare_modes:
+        # Timed separately: elapsed above includes output writing and may
+        # have been served from the cache
+        times = compare_executor_modes(plans, dataset_workers)
+        thread_time, process_time = times["thread"], times["process"]
+        report.info["compare_modes"] = {mode: round(seconds, 4) for mode, seconds in times.items()}
+        print(f"thread: {thread_time:.2f}s, process: {process_time:.2f}s, "
+              f"speed-up: {thread_time / process_time if process_time else float('nan'):.2f}x")
+
+    report.info.update(output_path=output_path, elapsed_s=round(elapsed, 4), **totals)
+    if dedup_index is not None:
+        report.info.update(dedup_precedence=precedence, duplicates=dedup_index.report())
+        for pair in dedup_index.report():
+            print(f"  {pair['duplicates']} duplicates of {pair['kept_from']} dropped from {pair['dropped_from']}")
+    report_path = os.path.join(os.path.dirname(output_path), "run_report.json")
+    report.write(report_path)
+    print("Slowest stages:")
+    for wall, name, stage_name in report.slowest_stages(3):
+        print(f"  {name} / {stage_name}: {wall:.2f}s")
+    print(f"Run report saved to {report_path}")
+
+    print(f"Merged Social Media dataset saved to {output_path} with {totals['records']} records and reposts are {totals['reposts']}")
+
+def parse_root(value):
+    name, separator, path = value.partition("=")
+    if not separator or not name or not path:
+        raise argparse.ArgumentTypeError(f"expected NAME=PATH, got {value!r}")
+    return name, path
+
+def cli(argv=None):
+    parser = argparse.ArgumentParser(description="Merge the selected social media datasets into one unified dataset")
+    parser.add_argument("--datasets", nargs="+", metavar="NAME",
+                        help="datasets to merge, in this order (default: the enabled ones in the registry)")
+    parser.add_argument("--root", action="append", type=parse_root, default=[], metavar="NAME=PATH",
+                        help="read a dataset from PATH instead of its registry path; repeatable")
+    parser.add_argument("--registry", default=REGISTRY_PATH, help="dataset registry (default: configs/datasets.json)")
+    parser.add_argument("--list", action="store_true", help="list the registered datasets and exit")
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    parser.add_argument("--dataset-workers", type=int, help="datasets processed at once")
+    parser.add_argument("--read-workers", type=int, help="file-reading threads per process")
+    parser.add_argument("--output-format", choices=["jsonl", "parquet", "arrow", "json"], default="jsonl")
+    parser.add_argument("--compression", choices=["gzip", "bz2", "xz"], help="JSONL output compression")
+    parser.add_argument("--shards", type=int, help="build the json output out of core over this many shards")
+    parser.add_argument("--json-backend", help="JSON decoder used by the loaders")
+    parser.add_argument("--csv-engine", choices=["c", "pyarrow"])
+    parser.add_argument("--no-cache", action="store_true", help="rebuild every dataset")
+    parser.add_argument("--hash-contents", action="store_true", help="fingerprint cached sources by content")
+    parser.add_argument("--no-dedup", action="store_true", help="keep posts found in several datasets")
+    parser.add_argument("--dedup-precedence", nargs="+", metavar="NAME", help="datasets whose copy of a post wins")
+    parser.add_argument("--no-language-id", action="store_true",
+                        help="keep each dataset's declared languages instead of detecting them per record")
+    parser.add_argument("--no-stats", action="store_true", help="do not write the stats_cube.arrow summaries")
+    parser.add_argument("--compare-modes", action="store_true", help="also time both executor modes on the same uncached work")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, entry in load_registry(args.registry).items():
+            print(f"{'*' if entry['enabled'] else ' '} {name:<20}{entry['platform']:<16}{entry['path']}")
+        return
+
+    roots = dict(args.root)
+    try:
+        # Unknown names and roots of unselected datasets are usage errors
+        select_datasets(load_registry(args.registry), args.datasets, roots)
+    except ValueError as e:
+        parser.error(str(e))
+
+    main(executor_mode=args.executor, compare_modes=args.compare_modes, output_format=args.output_format,
+         compression=args.compression, use_cache=not args.no_cache, hash_contents=args.hash_contents,
+         json_backend=args.json_backend, dataset_workers=args.dataset_workers, read_workers=args.read_workers,
+         csv_engine=args.csv_engine, dedup=not args.no_dedup, dedup_precedence=args.dedup_precedence,
+         shards=args.shards, datasets=args.datasets, roots=roots, registry_path=args.registry,
+         language_id=not args.no_language_id, stats=not args.no_stats)
+
+# Run the command line interface if this script is executed
 if __name__ == '__main__':
-    main()
+    cli()
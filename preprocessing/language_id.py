@@ -0,0 +1,211 @@
+import os
+import json
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from pandas.util import hash_pandas_object
+from preprocessing.text_cleaner import clean_text
+
+# Per-record language of cleaned text, without any network or model download:
+# the dominant Unicode script decides non-Latin text outright (Han is "zh",
+# or "ja" when kana is present), and Latin text is scored against character
+# 1-3 gram profiles of the languages its dataset declares. Text without
+# letters is "und". Set to "0" to keep the declared DATA_PATHS string instead
+# (also read by process-pool workers).
+LANGUAGE_ID_ENV_VAR = "MERGER_LANGUAGE_ID"
+
+PROFILES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "language_profiles.json")
+UNDETERMINED = "und"
+
+MAX_GRAM = 3
+HASH_BITS = 16
+BATCH_SIZE = 4096
+CACHE_SIZE = 1 << 20
+
+# (script, code point ranges); the script with the most code points in a
+# text wins and maps to its language, Latin going on to the n-gram profiles
+SCRIPTS = [
+    ("latin", [(0x61, 0x7A), (0x41, 0x5A), (0xC0, 0xD6), (0xD8, 0xF6), (0xF8, 0x24F)]),
+    ("han", [(0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xF900, 0xFAFF)]),
+    ("kana", [(0x3040, 0x30FF), (0x31F0, 0x31FF)]),
+    ("hangul", [(0x1100, 0x11FF), (0x3130, 0x318F), (0xAC00, 0xD7AF)]),
+    ("arabic", [(0x600, 0x6FF), (0x750, 0x77F)]),
+    ("cyrillic", [(0x400, 0x4FF)]),
+    ("greek", [(0x370, 0x3FF)]),
+    ("hebrew", [(0x590, 0x5FF)]),
+    ("devanagari", [(0x900, 0x97F)]),
+    ("thai", [(0xE00, 0xE7F)]),
+]
+SCRIPT_LANGUAGES = {
+    "han": "zh", "kana": "ja", "hangul": "ko", "arabic": "ar", "cyrillic": "ru",
+    "greek": "el", "hebrew": "he", "devanagari": "hi", "thai": "th",
+}
+
+_enabled = True
+
+# (candidate languages, text hash) -> language, shared by every batch of the
+# process so a text repeated across datasets or retweets is classified once
+_cache = {}
+
+
+def clear_cache():
+    _cache.clear()
+
+
+def set_language_id(enabled=True):
+    global _enabled
+    _enabled = bool(enabled)
+    return _enabled
+
+
+def language_id_enabled():
+    return _enabled
+
+
+@lru_cache(maxsize=None)
+def _script_table():
+    # Script number (1-based position in SCRIPTS, 0 for none) of every BMP code point
+    table = np.zeros(0x10000, dtype=np.uint8)
+    for number, (_, ranges) in enumerate(SCRIPTS, start=1):
+        for lo, hi in ranges:
+            table[lo:hi + 1] = number
+    return table
+
+
+def _word_grams(words):
+    # Script counts (words x SCRIPTS) of the given distinct words, and the
+    # hash bucket and word number of every 1..MAX_GRAM gram of Latin letters
+    # in each word padded with spaces; a gram's key packs its 21-bit code
+    # points exactly. Words are NUL-separated so no gram spans two of them.
+    joined = "\0".join(f" {word} " for word in words)
+    codes = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    lengths = np.fromiter((len(word) + 3 for word in words), dtype=np.int64, count=len(words))
+    word_ids = np.repeat(np.arange(len(words)), lengths)[:len(codes)]
+
+    scripts = _script_table()[np.minimum(codes, 0xFFFF)] * (codes <= 0xFFFF)
+    counts = np.bincount(word_ids * (len(SCRIPTS) + 1) + scripts, minlength=len(words) * (len(SCRIPTS) + 1))
+    counts = counts.reshape(len(words), len(SCRIPTS) + 1)[:, 1:]
+
+    valid = (scripts == 1) | (codes == 0x20)
+    buckets, starts = [], []
+    keys = np.zeros(len(codes), dtype=np.uint64)
+    ok = np.ones(len(codes), dtype=bool)
+    for n in range(1, MAX_GRAM + 1):
+        count = len(codes) - n + 1
+        if count <= 0:
+            break
+        keys = (keys[:count] << np.uint64(21)) | codes[n - 1:n - 1 + count]
+        ok = ok[:count] & valid[n - 1:n - 1 + count]
+        positions = np.flatnonzero(ok)
+        buckets.append((keys[positions] * np.uint64(0x9E3779B97F4A7C15)) >> np.uint64(64 - HASH_BITS))
+        starts.append(positions)
+    buckets = np.concatenate(buckets).astype(np.int64) if buckets else np.empty(0, dtype=np.int64)
+    starts = np.concatenate(starts) if starts else np.empty(0, dtype=np.int64)
+    return counts, buckets, word_ids[starts]
+
+
+@lru_cache(maxsize=None)
+def _profiles():
+    # (languages, log-probability table of shape languages x buckets), built
+    # from the cleaned training text of language_profiles.json
+    with open(PROFILES_PATH, "r", encoding="utf-8") as f:
+        samples = json.load(f)
+    languages = list(samples)
+    table = np.empty((len(languages), 1 << HASH_BITS), dtype=np.float32)
+    for row, language in enumerate(languages):
+        _, buckets, _ = _word_grams(clean_text(samples[language]).split())
+        counts = np.bincount(buckets, minlength=table.shape[1]).astype(np.float64)
+        table[row] = np.log((counts + 0.5) / (counts.sum() + 0.5 * table.shape[1]))
+    return languages, table
+
+
+@lru_cache(maxsize=None)
+def _candidate_table(candidates):
+    languages, table = _profiles()
+    return table[[languages.index(code) for code in candidates]]
+
+
+def profile_languages():
+    return list(_profiles()[0])
+
+
+def candidate_languages(declared):
+    # Profiled languages among a dataset's declared ones ("en,es,fr"); all of
+    # them when none is profiled
+    languages = _profiles()[0]
+    declared = [code.strip() for code in (declared or "").split(",")]
+    candidates = tuple(code for code in languages if code in declared)
+    return candidates or tuple(languages)
+
+
+def _classify(texts, candidates):
+    # Script counts and gram scores are computed once per distinct word of
+    # the batch and summed per text with reduceat, in token order
+    split = [text.split() for text in texts]
+    token_counts = np.fromiter(map(len, split), dtype=np.int64, count=len(split))
+    token_codes, words = pd.factorize(np.array([word for words in split for word in words], dtype=object))
+
+    counts, buckets, gram_words = _word_grams(list(words))
+    features = np.zeros((len(words), len(SCRIPTS) + len(candidates)))
+    features[:, :len(SCRIPTS)] = counts
+    if len(candidates) > 1:
+        # Naive Bayes log-likelihood of each word's grams under every candidate
+        table = _candidate_table(candidates)
+        for j in range(len(candidates)):
+            features[:, len(SCRIPTS) + j] = np.bincount(gram_words, weights=table[j][buckets], minlength=len(words))
+
+    totals = np.zeros((len(texts), features.shape[1]))
+    has_tokens = token_counts > 0
+    if has_tokens.any():
+        firsts = np.concatenate([[0], np.cumsum(token_counts)[:-1]])[has_tokens]
+        totals[has_tokens] = np.add.reduceat(features[token_codes], firsts, axis=0)
+    counts, scores = totals[:, :len(SCRIPTS)], totals[:, len(SCRIPTS):]
+
+    dominant = counts.argmax(axis=1)
+    result = np.array([SCRIPT_LANGUAGES.get(name, UNDETERMINED) for name, _ in SCRIPTS], dtype=object)[dominant]
+    result[(dominant == 1) & (counts[:, 2] > 0)] = "ja"
+    result[counts.sum(axis=1) == 0] = UNDETERMINED
+    latin = (dominant == 0) & (counts[:, 0] > 0)
+    result[latin] = np.array(candidates, dtype=object)[scores[latin].argmax(axis=1)]
+    return result
+
+
+def detect_languages(texts, declared=None):
+    # Language code per cleaned text (a pandas Series), considering the
+    # declared languages for Latin text. Distinct texts are classified once,
+    # in vectorized batches, and remembered by hash across calls. Returns the
+    # codes and a dict of counts.
+    texts = pd.Series(texts, dtype=object).fillna("").astype(str)
+    candidates = candidate_languages(declared)
+    codes, uniques = pd.factorize(texts)
+    hashes = hash_pandas_object(pd.Series(uniques, dtype=object), index=False).to_numpy()
+
+    languages = np.empty(len(uniques), dtype=object)
+    missing = []
+    for i, text_hash in enumerate(hashes.tolist()):
+        language = _cache.get((candidates, text_hash))
+        if language is None:
+            missing.append(i)
+        else:
+            languages[i] = language
+
+    for start in range(0, len(missing), BATCH_SIZE):
+        batch = missing[start:start + BATCH_SIZE]
+        languages[batch] = _classify([uniques[i] for i in batch], candidates)
+
+    if len(_cache) + len(missing) > CACHE_SIZE:
+        _cache.clear()
+    for i in missing:
+        _cache[(candidates, int(hashes[i]))] = languages[i]
+
+    result = pd.Series(languages[codes], index=texts.index, name="language", dtype=object)
+    stats = {
+        "unique_texts": len(uniques),
+        "cache_hits": len(uniques) - len(missing),
+        "classified": len(missing),
+        "candidates": len(candidates),
+    }
+    return result, stats
+
+
+set_language_id((os.environ.get(LANGUAGE_ID_ENV_VAR) or "1") != "0")
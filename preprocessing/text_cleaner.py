@@ -1,15 +1,40 @@
 import re
+import warnings
 import string
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 from datetime import datetime
 
+# Compiled once at import instead of on every call
+URL_PATTERN = re.compile(r"http\S+")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+PUNCTUATION_TABLE = str.maketrans("", "", string.punctuation)
+
 def clean_text(text):
     text = text.lower()
-    text = re.sub(r"http\S+", "", text)  # remove URLs
-    text = text.translate(str.maketrans("", "", string.punctuation))  # remove punctuation
-    text = re.sub(r"\s+", " ", text).strip()  # normalize whitespace
+    text = URL_PATTERN.sub("", text)  # remove URLs
+    text = text.translate(PUNCTUATION_TABLE)  # remove punctuation
+    text = WHITESPACE_PATTERN.sub(" ", text).strip()  # normalize whitespace
     return text
 
+def clean_text_series(texts):
+    # Batch version of clean_text for a whole column (pandas Series or Arrow
+    # array). Values are cast with astype(str) like the per-row path, and each
+    # distinct text is cleaned only once, which pays off on retweet-heavy columns.
+    is_arrow = isinstance(texts, (pa.Array, pa.ChunkedArray))
+    if is_arrow:
+        texts = texts.to_pandas()
+
+    texts = texts.astype(str)
+    codes, uniques = pd.factorize(texts)
+    cleaned = np.array([clean_text(text) for text in uniques], dtype=object)
+    result = pd.Series(cleaned[codes], index=texts.index, name=texts.name, dtype=object)
+
+    if is_arrow:
+        return pa.array(result, type=pa.string())
+    return result
+
 def standardize_timestamp(value):
  # Try UNIX timestamp
     try:
@@ -30,3 +55,99 @@ def standardize_timestamp(value):
         return pd.NaT
 
 
+TWITTER_TIMESTAMP_FORMAT = '%a %b %d %H:%M:%S %z %Y'
+
+def detect_timestamp_format(values, sample_size=1000):
+    # Guess a format hint from a sample of non-empty values: "unix" for epoch
+    # seconds, the Twitter format, or None when neither fits most of the sample
+    sample = values.dropna()
+    sample = sample[sample.astype(str).str.strip() != ""].head(sample_size)
+    if sample.empty:
+        return None
+
+    if pd.to_numeric(sample, errors='coerce').notna().mean() > 0.5:
+        return "unix"
+    if pd.to_datetime(sample.astype(str), format=TWITTER_TIMESTAMP_FORMAT, errors='coerce').notna().mean() > 0.5:
+        return TWITTER_TIMESTAMP_FORMAT
+    return None
+
+def standardize_timestamp_series(values, fmt=None):
+    # Column version of standardize_timestamp. Numeric values are converted as
+    # UNIX seconds and the rest parsed with the format hint in one to_datetime
+    # call each, then ISO-style strings in one more; only rows none of these
+    # understand go through the per-row function. Returns the parsed column
+    # and a dict of parse counts.
+    values = pd.Series(values)
+    original_index = values.index
+    values = values.reset_index(drop=True)
+    index = values.index
+    if fmt is None:
+        fmt = detect_timestamp_format(values)
+
+    pieces = []
+
+    # UNIX timestamps, truncated to whole seconds like int(float(value))
+    numeric = pd.to_numeric(values, errors='coerce').astype(float)
+    unix_rows = np.isfinite(numeric)
+    unix_parsed = pd.to_datetime(np.trunc(numeric[unix_rows]).astype('int64'), unit='s', errors='coerce')
+    unix_ok = unix_parsed.notna()
+    pieces.append(unix_parsed[unix_ok])
+
+    pending = values.notna() & ~unix_rows
+    pending[unix_parsed.index[~unix_ok]] = True
+
+    # Blank strings (Weibo-Rumor's default "") are NaT without parsing
+    blank = values[pending].astype(str).str.strip() == ""
+    pending[blank.index[blank]] = False
+
+    format_ok_count = 0
+    if fmt is not None and fmt != "unix":
+        candidates = values[pending]
+        hinted = pd.to_datetime(candidates.astype(str), format=fmt, errors='coerce')
+        hinted_ok = hinted.notna()
+        pieces.append(hinted[hinted_ok])
+        pending[hinted.index[hinted_ok]] = False
+        format_ok_count = int(hinted_ok.sum())
+
+    # ISO-style strings ("2012-11-13 16:55") in one vectorized pass; a column
+    # pandas cannot hold as one datetime dtype (mixed UTC offsets) is left
+    # to the per-row path
+    iso_ok_count = 0
+    if pending.any():
+        candidates = values[pending]
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", FutureWarning)
+                iso = pd.to_datetime(candidates.astype(str), format="ISO8601", errors='coerce')
+        except (ValueError, TypeError):
+            iso = None
+        if iso is not None and pd.api.types.is_datetime64_any_dtype(iso):
+            iso_ok = iso.notna()
+            pieces.append(iso[iso_ok])
+            pending[iso.index[iso_ok]] = False
+            iso_ok_count = int(iso_ok.sum())
+
+    # Slow path for whatever is left
+    fallback = values[pending].apply(standardize_timestamp)
+    fallback_count = len(fallback)
+    pieces.append(fallback[fallback.notna()])
+
+    pieces = [piece for piece in pieces if len(piece)]
+    if pieces:
+        combined = pd.concat(pieces) if len(pieces) > 1 else pieces[0]
+        result = combined.reindex(index, fill_value=pd.NaT)
+    else:
+        result = pd.Series(pd.NaT, index=index, dtype='datetime64[ns]')
+    result.index = original_index
+
+    stats = {
+        "format": fmt,
+        "rows": len(values),
+        "unix": int(unix_ok.sum()),
+        "format_matched": format_ok_count,
+        "iso_matched": iso_ok_count,
+        "blank": int(blank.sum()),
+        "fallback": fallback_count,
+        "failed": int(result.isna().sum()),
+    }
+    return result, stats
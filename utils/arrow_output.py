@@ -0,0 +1,30 @@
+import os
+from contextlib import contextmanager
+import pyarrow as pa
+from utils.parquet_output import PARQUET_SCHEMA, originals_to_table
+
+# Written uncompressed: compressed IPC buffers cannot be memory-mapped as views
+ARROW_SCHEMA = PARQUET_SCHEMA
+
+
+@contextmanager
+def open_arrow_output(path):
+    # Yields write(originals, reposts, dataset_name) -> rows written. Each
+    # dataset is appended as its own record batches, so datasets stay
+    # contiguous; the file replaces path only once it is complete, so open
+    # readers of the previous file are never disturbed.
+    tmp_path = path + ".tmp"
+    try:
+        with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, ARROW_SCHEMA) as writer:
+
+            def write(originals, reposts, dataset_name):
+                table = originals_to_table(originals, reposts, dataset_name)
+                writer.write_table(table)
+                return table.num_rows
+
+            yield write
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
@@ -0,0 +1,71 @@
+import pyarrow as pa
+
+
+class MergedArrow:
+    # Read-only view of the merged Arrow IPC file (output_format="arrow").
+    # The file is memory-mapped and nothing is decoded or copied on open:
+    # columns and slices are Arrow views into the mapping, so only the pages
+    # actually touched become resident. to_pandas() is the one call that copies.
+    #
+    #     with MergedArrow("processed_data/final_dataset.arrow") as corpus:
+    #         texts = corpus.column("text")
+    #         weibo = corpus.dataset("CED", columns=["text", "label"])
+
+    def __init__(self, path):
+        self.path = path
+        self.source = pa.memory_map(path, "r")
+        self.reader = pa.ipc.open_file(self.source)
+        self.table = self.reader.read_all()
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def schema(self):
+        return self.table.schema
+
+    @property
+    def column_names(self):
+        return self.table.column_names
+
+    def column(self, name):
+        # pa.ChunkedArray, one chunk per record batch
+        return self.table.column(name)
+
+    def slice(self, start=0, stop=None, columns=None):
+        stop = len(self) if stop is None else min(stop, len(self))
+        table = self.table.select(columns) if columns is not None else self.table
+        return table.slice(start, max(stop - start, 0))
+
+    def dataset_ranges(self):
+        # {dataset: (start, stop)} from the record batch layout; only the
+        # first value of each batch's dataset column is read
+        ranges = {}
+        start = 0
+        for i in range(self.reader.num_record_batches):
+            batch = self.reader.get_batch(i)
+            if batch.num_rows:
+                name = batch.column("dataset")[0].as_py()
+                first, _ = ranges.get(name, (start, None))
+                ranges[name] = (first, start + batch.num_rows)
+            start += batch.num_rows
+        return ranges
+
+    def dataset(self, name, columns=None):
+        start, stop = self.dataset_ranges().get(name, (0, 0))
+        return self.slice(start, stop, columns)
+
+    def to_pandas(self, columns=None, start=0, stop=None):
+        return self.slice(start, stop, columns).to_pandas()
+
+    def close(self):
+        self.table = None
+        self.reader = None
+        self.source.close()
+
@@ -0,0 +1,120 @@
+import os
+import json
+import pickle
+import hashlib
+from functools import lru_cache
+from utils.io_helpers import pack_frame, unpack_frame
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Sources (code and data files such as the language profiles) whose changes
+# can alter processed output
+CODE_PATHS = ["merge_datasets.py", "preprocessing", "utils"]
+
+
+def _iter_files(path):
+    # Every file below path in a stable (sorted) order
+    if os.path.isfile(path):
+        yield path, os.stat(path)
+        return
+
+    with os.scandir(path) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+    for entry in entries:
+        if entry.is_dir():
+            yield from _iter_files(entry.path)
+        elif entry.is_file():
+            yield entry.path, entry.stat()
+
+
+def _hash_file(filepath, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def fingerprint_source(path, hash_contents=False):
+    # Relative path, size and mtime of every file; contents only on request
+    h = hashlib.sha256()
+    file_count = 0
+    for filepath, stat in _iter_files(path):
+        rel_path = os.path.relpath(filepath, path) if os.path.isdir(path) else os.path.basename(filepath)
+        h.update(f"{rel_path}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode("utf-8"))
+        if hash_contents:
+            h.update(_hash_file(filepath).encode("ascii"))
+        file_count += 1
+    return h.hexdigest(), file_count
+
+
+@lru_cache(maxsize=None)
+def code_version():
+    h = hashlib.sha256()
+    for code_path in CODE_PATHS:
+        for filepath, _ in _iter_files(os.path.join(REPO_ROOT, code_path)):
+            if filepath.endswith((".py", ".json")):
+                h.update(os.path.relpath(filepath, REPO_ROOT).encode("utf-8"))
+                h.update(_hash_file(filepath).encode("ascii"))
+    return h.hexdigest()
+
+
+def dataset_fingerprint(dataset_name, path, mapping, dataset_info, hash_contents=False):
+    source_hash, file_count = fingerprint_source(path, hash_contents)
+    key = json.dumps({
+        "dataset": dataset_name,
+        "source": source_hash,
+        "mapping": mapping,
+        "dataset_info": dataset_info,
+        "code": code_version(),
+    }, sort_keys=True, ensure_ascii=False)
+    return {
+        "fingerprint": hashlib.sha256(key.encode("utf-8")).hexdigest(),
+        "files": file_count,
+        "hash_contents": hash_contents,
+    }
+
+
+def _cache_paths(cache_dir, dataset_name):
+    safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in dataset_name)
+    return os.path.join(cache_dir, f"{safe_name}.manifest.json"), os.path.join(cache_dir, f"{safe_name}.pkl")
+
+
+def load_cached(cache_dir, dataset_name, fingerprint):
+    # (originals, reposts) from the cache when the manifest fingerprint matches
+    manifest_path, data_path = _cache_paths(cache_dir, dataset_name)
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("fingerprint") != fingerprint["fingerprint"]:
+            return None
+        with open(data_path, "rb") as f:
+            originals, reposts = pickle.load(f)
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+        return None
+    return unpack_frame(originals), unpack_frame(reposts)
+
+
+def store_cached(cache_dir, dataset_name, fingerprint, originals, reposts):
+    os.makedirs(cache_dir, exist_ok=True)
+    manifest_path, data_path = _cache_paths(cache_dir, dataset_name)
+
+    # Drop the old manifest, then write data and manifest via rename so a
+    # crash never leaves a manifest pointing at other data
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    tmp_path = data_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump((pack_frame(originals), pack_frame(reposts)), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, data_path)
+
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "dataset": dataset_name,
+            **fingerprint,
+            "originals": 0 if originals is None else len(originals),
+            "reposts": 0 if reposts is None else len(reposts),
+        }, f, indent=2)
+    os.replace(tmp_path, manifest_path)
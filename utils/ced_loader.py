@@ -0,0 +1,102 @@
+import os
+import pandas as pd
+from utils.json_decoder import fields_spec
+from utils.parallel_reader import read_json_items
+
+CED_ORIGINAL_FIELDS = fields_spec("text", "time", "reposts", "likes", "user.followers", "user.friends", "user.verified")
+CED_REPOST_FIELDS = fields_spec("text")
+
+# A microblog's label is the first of these repost directories holding its file
+CED_LABEL_DIRS = [("rumor", "rumor-repost"), ("nonrumor", "non-rumor-repost")]
+
+
+def _list_names(path):
+    try:
+        with os.scandir(path) as it:
+            return [entry.name for entry in it]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+def build_ced_index(path):
+    # Lists original-microblog and each repost directory once and returns
+    # (filename, label, repost_file) for every labelled microblog, in listing
+    # order; no per-file stat calls
+    original_files = [filename for filename in os.listdir(os.path.join(path, 'original-microblog'))
+                      if filename.endswith('.json')]
+    label_dirs = [(label, os.path.join(path, dirname)) for label, dirname in CED_LABEL_DIRS]
+    label_names = [(label, dirpath, set(_list_names(dirpath))) for label, dirpath in label_dirs]
+
+    index = []
+    for filename in original_files:
+        for label, dirpath, names in label_names:
+            if filename in names:
+                index.append((filename, label, os.path.join(dirpath, filename)))
+                break
+    return index
+
+
+def load_ced_dataset(path, originals=True, reposts=True):
+    # Returns (originals_df, reposts_df) from one index of the CED tree; the
+    # original and repost files of each microblog are read in the same pass.
+    # Either side is None when not requested.
+    original_path = os.path.join(path, 'original-microblog')
+    index = build_ced_index(path)
+
+    reads = []
+    for filename, label, repost_file in index:
+        if originals:
+            reads.append((os.path.join(original_path, filename), CED_ORIGINAL_FIELDS))
+        if reposts:
+            reads.append((repost_file, CED_REPOST_FIELDS))
+    results = read_json_items(reads)
+
+    original_records = []
+    repost_records = []
+
+    for filename, label, repost_file in index:
+        microblog_id = filename.replace('.json', '')
+
+        if originals:
+            data, error = next(results)
+            try:
+                if error is not None:
+                    raise error
+
+                user = data.get("user", {})
+                if not isinstance(user, dict):
+                    user = {}
+
+                original_records.append({
+                    "id": microblog_id,
+                    "text": data.get("text", ""),
+                    "time": data.get("time", None),
+                    "followers": user.get("followers", None),
+                    "friends": user.get("friends", None),
+                    "verified": user.get("verified", False),
+                    "reposts": data.get("reposts", 0),
+                    "likes": data.get("likes", 0),
+                    "label": label,
+                })
+
+            except Exception as e:
+                print(f"Error processing {filename}: {e}")
+
+        if reposts:
+            repost_data, error = next(results)
+            try:
+                if error is not None:
+                    raise error
+                for repost in repost_data:
+                    repost_records.append({
+                        "id": microblog_id,
+                        "text": repost.get("text", ""),
+                        "label": label
+                    })
+
+            except Exception as e:
+                print(f"Error processing repost file {filename}: {e}")
+
+    originals_df = pd.DataFrame(original_records) if originals else None
+    reposts_df = pd.DataFrame(repost_records) if reposts else None
+    return originals_df, reposts_df
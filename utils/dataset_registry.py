@@ -0,0 +1,87 @@
+import os
+import json
+import importlib
+from functools import lru_cache, partial
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REGISTRY_PATH = os.path.join(REPO_ROOT, "configs", "datasets.json")
+
+# JSON of the selected registry entries; set by main() so process-pool
+# workers (spawned, not forked, on Windows) run the same selection
+DATASETS_ENV_VAR = "MERGER_DATASETS"
+
+REQUIRED_KEYS = ["path", "language", "domain", "platform"]
+
+# Loaders are "module:function" import paths, called as function(*loader_args, path).
+# A combined loader returns (originals, reposts) from one pass over the sources.
+LOADER_KEYS = ["combined_loader", "loader", "repost_loader"]
+DEFAULT_LOADER = "utils.io_helpers:load_dataset"
+
+
+def load_registry(path=REGISTRY_PATH):
+    # {name: entry} in file order; only reads the JSON, no loader is imported
+    with open(path, "r", encoding="utf-8") as f:
+        registry = json.load(f)
+
+    for name, entry in registry.items():
+        missing = [key for key in REQUIRED_KEYS if key not in entry]
+        if missing:
+            raise ValueError(f"{path}: dataset {name!r} is missing {', '.join(missing)}")
+        for key in LOADER_KEYS:
+            if key in entry and ":" not in entry[key]:
+                raise ValueError(f"{path}: {name}.{key} must be 'module:function', got {entry[key]!r}")
+        entry.setdefault("enabled", True)
+    return registry
+
+
+def select_datasets(registry, names=None, roots=None):
+    # Entries of the named datasets in the order given (the enabled ones in
+    # registry order by default); roots maps a selected name to a replacement path
+    if names is None:
+        names = [name for name, entry in registry.items() if entry["enabled"]]
+    unknown = [name for name in list(names) + list(roots or {}) if name not in registry]
+    if unknown:
+        raise ValueError(f"Unknown dataset(s) {', '.join(unknown)} (choose from {', '.join(registry)})")
+    # A root for a dataset that is not built would be silently ignored
+    unselected = [name for name in (roots or {}) if name not in names]
+    if unselected:
+        raise ValueError(f"Root given for unselected dataset(s) {', '.join(unselected)} "
+                         f"(selected: {', '.join(names)})")
+
+    selected = {}
+    for name in names:
+        entry = dict(registry[name])
+        if roots and name in roots:
+            entry["path"] = roots[name]
+        selected[name] = entry
+    return selected
+
+
+def active_datasets():
+    # The selection exported by main(), else the enabled registry entries
+    selected = os.environ.get(DATASETS_ENV_VAR)
+    if selected:
+        return json.loads(selected)
+    return select_datasets(load_registry())
+
+
+def data_paths(datasets):
+    # DATA_PATHS layout: name -> [path, language, domain, platform]
+    return {name: [entry[key] for key in REQUIRED_KEYS] for name, entry in datasets.items()}
+
+
+@lru_cache(maxsize=None)
+def _resolve(import_path):
+    module_name, _, attribute = import_path.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def get_loader(entry, key):
+    # Callable taking the dataset path, or None when the entry has no such
+    # loader; the loader's module is imported here, on first use
+    import_path = entry.get(key, DEFAULT_LOADER if key == "loader" else None)
+    if import_path is None:
+        return None
+    loader = _resolve(import_path)
+    args = entry.get("loader_args", [])
+    return partial(loader, *args) if args else loader
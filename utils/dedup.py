@@ -0,0 +1,124 @@
+from collections import Counter
+import numpy as np
+import pandas as pd
+from pandas.util import hash_pandas_object
+
+# post_id values that do not identify a post (update_fields fills a missing id column with 0)
+MISSING_IDS = ["", "0", "nan", "none", "<na>"]
+
+
+def record_keys(df):
+    # Stable 64-bit key per row: (platform, post_id), or (platform, normalized
+    # text) when the id is missing. Only the first platform of a multi-platform
+    # dataset ("Twitter,Reddit") is used, so its tweets meet the other Twitter sets.
+    platform = df["platform"].astype("string").str.split(",").str[0].str.strip().str.lower()
+    post_id = df["post_id"].astype("string").str.strip()
+    missing = post_id.isna() | post_id.str.lower().isin(MISSING_IDS)
+    # Text is normalized only for the (usually few) rows keyed by it
+    value = post_id.copy()
+    value[missing] = df["text"][missing].astype("string").str.casefold().str.split().str.join(" ")
+
+    parts = pd.DataFrame({
+        "platform": platform,
+        "kind": pd.Series("text", index=df.index).where(missing, "id"),
+        "value": value.fillna(""),
+    })
+    return hash_pandas_object(parts, index=False).to_numpy()
+
+
+def in_precedence_order(df, order, source_column):
+    # Rows sorted (stably) by the position of their source_column dataset in order
+    if df is None:
+        return None
+    rank = {name: position for position, name in enumerate(order)}
+    return df.take(np.argsort(df[source_column].map(rank).to_numpy(), kind="stable")).reset_index(drop=True)
+
+
+class DedupIndex:
+    # Keys of every record kept so far and the dataset that kept them; feed
+    # datasets in precedence order and the first one to hold a key wins
+    def __init__(self):
+        self.owners = pd.Series([], dtype=object, index=pd.Index([], dtype="uint64"))
+        self.pairs = Counter()
+
+    def apply(self, dataset_name, originals, reposts=None):
+        # Returns (originals, reposts) without the records an earlier dataset
+        # already holds; reposts of dropped originals go with them
+        keys = record_keys(originals)
+        owners = self.owners.reindex(keys).to_numpy()
+        duplicate = pd.notna(owners)
+
+        for owner, count in Counter(owners[duplicate]).items():
+            self.pairs[(owner, dataset_name)] += count
+
+        new_keys = pd.unique(keys[~duplicate])
+        self.owners = pd.concat([self.owners, pd.Series(dataset_name, index=pd.Index(new_keys, dtype="uint64"))])
+
+        if not duplicate.any():
+            return originals, reposts
+
+        kept = originals[~duplicate]
+        if reposts is not None:
+            dropped_ids = set(originals["post_id"][duplicate]) - set(kept["post_id"])
+            reposts = reposts[~reposts["post_id"].isin(dropped_ids)]
+        return kept, reposts
+
+    def apply_shard(self, originals, reposts, order, source_column):
+        # Shard-at-a-time version of apply() for spilled records tagged with
+        # their dataset in source_column: rows are put in precedence order
+        # (stably) and a record is dropped when a dataset earlier in order
+        # holds its key, as if the datasets had been applied one by one.
+        # Returns (originals, reposts, {dataset: rows dropped}).
+        originals = in_precedence_order(originals, order, source_column)
+        reposts = in_precedence_order(reposts, order, source_column)
+
+        rank = {name: position for position, name in enumerate(order)}
+        ranks = originals[source_column].map(rank).to_numpy()
+        first = pd.Series(ranks).groupby(record_keys(originals)).transform("min").to_numpy()
+        duplicate = ranks > first
+        if not duplicate.any():
+            return originals, reposts, {}
+
+        sources = originals[source_column].to_numpy(dtype=object)
+        for (owner, dropped), count in Counter(zip(np.asarray(order, dtype=object)[first[duplicate]],
+                                                   sources[duplicate])).items():
+            self.pairs[(owner, dropped)] += count
+
+        kept = originals[~duplicate]
+        if reposts is not None:
+            # Reposts go with a dropped original unless its dataset kept
+            # another record with the same post_id
+            def pairs(df):
+                return pd.MultiIndex.from_arrays([df[source_column], df["post_id"]])
+            dropped_pairs = pairs(originals[duplicate]).difference(pairs(kept))
+            reposts = reposts[~pairs(reposts).isin(dropped_pairs)]
+        return kept, reposts, dict(Counter(sources[duplicate]))
+
+    def report(self):
+        return [
+            {"kept_from": kept, "dropped_from": dropped, "duplicates": count}
+            for (kept, dropped), count in sorted(self.pairs.items(), key=lambda item: -item[1])
+        ]
+
+
+class PrecedenceBuffer:
+    # Wraps an on_result callback so datasets reach it in precedence order,
+    # holding finished ones until every dataset ranked before them is done
+    def __init__(self, order, on_result):
+        self.order = list(order)
+        self.on_result = on_result
+        self.pending = {}
+        self.position = 0
+
+    def __call__(self, name, originals, reposts):
+        self.pending[name] = (originals, reposts)
+        while self.position < len(self.order) and self.order[self.position] in self.pending:
+            self.on_result(self.order[self.position], *self.pending.pop(self.order[self.position]))
+            self.position += 1
+
+    def finish(self):
+        # Datasets that failed never arrive; release everything still held
+        for name in self.order[self.position:]:
+            if name in self.pending:
+                self.on_result(name, *self.pending.pop(name))
+        self.position = len(self.order)
@@ -1,9 +1,17 @@
+import numpy as np
 import pandas as pd
 import json
 import os
+import gzip
+import bz2
+import lzma
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from utils.run_report import record_file_read
 
 def load_dataset(file_path):
     ext = os.path.splitext(file_path)[1].lower()
+    record_file_read(file_path)
     
     if ext == ".csv":
         return pd.read_csv(file_path)
@@ -21,9 +29,144 @@ def load_dataset(file_path):
 
     
     
+# pandas engine for read_table_columns: "c" (default) or "pyarrow", the
+# multithreaded Arrow CSV reader; set to choose it in process-pool workers too
+CSV_ENGINE_ENV_VAR = "MERGER_CSV_ENGINE"
+CSV_ENGINES = ["c", "pyarrow"]
+
+_csv_engine = "c"
+
+
+def set_csv_engine(name=None):
+    global _csv_engine
+    name = name or "c"
+    if name not in CSV_ENGINES:
+        raise ValueError(f"Unsupported CSV engine {name!r} (choose from {', '.join(CSV_ENGINES)})")
+    _csv_engine = name
+    return name
+
+
+def active_csv_engine():
+    return _csv_engine
+
+
+def _arrow_type(dtype):
+    dtype = pd.api.types.pandas_dtype(dtype)
+    return pa.string() if isinstance(dtype, pd.StringDtype) else pa.from_numpy_dtype(dtype)
+
+
+def _read_arrow_csv(path, columns, dtypes, sep=",", names=None, header="infer"):
+    # pandas' own pyarrow engine cannot combine names= with usecols, so the
+    # Arrow reader is driven directly; empty strings are missing, as in pandas
+    read_options = pa_csv.ReadOptions(column_names=names, skip_rows=1 if names is not None and header == 0 else 0)
+    parse_options = pa_csv.ParseOptions(delimiter=sep, newlines_in_values=True)
+    convert_options = pa_csv.ConvertOptions(
+        include_columns=columns,
+        column_types={column: _arrow_type(dtype) for column, dtype in dtypes.items()},
+        strings_can_be_null=True,
+    )
+    table = pa_csv.read_csv(path, read_options=read_options, parse_options=parse_options,
+                            convert_options=convert_options)
+    return table.to_pandas(types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get)
+
+
+def read_table_columns(path, columns, dtypes, **kwargs):
+    # Reads only columns (named as in names= when given) with explicit dtypes
+    record_file_read(path)
+    if _csv_engine == "pyarrow" and not kwargs.get("skipinitialspace"):
+        return _read_arrow_csv(path, columns, dtypes, **kwargs)
+    # skipinitialspace has no Arrow equivalent, so those files stay on the C engine
+    return pd.read_csv(path, usecols=columns, dtype=dtypes, engine="c", **kwargs)
+
+
 def save_dataset(df, path):
     df.to_parquet(path, index=False)
 
 def load_mappings(mapping_file):
     with open(mapping_file, "r", encoding="utf-8") as f:
         return json.load(f)
+
+
+def pack_frame(df):
+    # Compact, pickle-friendly form of a DataFrame for crossing process boundaries
+    if df is None:
+        return None
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        # Mixed-type object columns: fall back to the raw column arrays
+        return ("columns", {col: df[col].array for col in df.columns})
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return ("arrow", sink.getvalue().to_pybytes())
+
+def unpack_frame(packed):
+    if packed is None:
+        return None
+    kind, payload = packed
+    if kind == "arrow":
+        return pa.ipc.open_stream(payload).read_all().to_pandas()
+    return pd.DataFrame(payload)
+
+COMPRESSION_EXTENSIONS = {
+    None: "",
+    "gzip": ".gz",
+    "bz2": ".bz2",
+    "xz": ".xz",
+}
+
+def jsonl_output_path(path, compression=None):
+    if compression not in COMPRESSION_EXTENSIONS:
+        raise ValueError(f"Unsupported compression: {compression}")
+    return path + COMPRESSION_EXTENSIONS[compression]
+
+def open_output(path, compression=None):
+    # Binary handle, optionally compressed on the fly; write_jsonl encodes
+    # each chunk itself so it knows every line's byte length
+    if compression == "gzip":
+        return gzip.open(path, "wb")
+    elif compression == "bz2":
+        return bz2.open(path, "wb")
+    elif compression == "xz":
+        return lzma.open(path, "wb")
+    elif compression is None:
+        return open(path, "wb")
+    raise ValueError(f"Unsupported compression: {compression}")
+
+def write_jsonl(df, f, reposts=None, chunk_size=10000):
+    # One JSON record per line, serialized chunk by chunk so only chunk_size
+    # records are ever held as text. reposts (a RepostLists) is materialized
+    # into the "reposts" field one chunk at a time. f is a binary handle;
+    # returns the byte length of every line written, newline included.
+    lengths = []
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        if reposts is not None:
+            chunk = chunk.assign(reposts=reposts.to_records(start, start + len(chunk)))
+        lines = chunk.to_json(orient="records", lines=True, force_ascii=False)
+        data = (lines if lines.endswith("\n") else lines + "\n").encode("utf-8")
+        f.write(data)
+        # JSON escapes newlines inside strings, so every newline ends a record
+        ends = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == 10)
+        lengths.append(np.diff(ends, prepend=-1))
+    return np.concatenate(lengths) if lengths else np.empty(0, dtype=np.int64)
+
+def write_json_array(parts, f, chunk_size=10000):
+    # Same text as DataFrame.to_json(orient="records", indent=2) of all parts
+    # concatenated, written chunk by chunk; parts yields (df, reposts) pairs
+    f.write("[\n")
+    separator = ""
+    for df, reposts in parts:
+        for start in range(0, len(df), chunk_size):
+            chunk = df.iloc[start:start + chunk_size]
+            if reposts is not None:
+                chunk = chunk.assign(reposts=reposts.to_records(start, start + len(chunk)))
+            # Drop the chunk's own "[\n" and "\n]"
+            f.write(separator + chunk.to_json(orient="records", force_ascii=False, indent=2)[2:-2])
+            separator = ",\n"
+    f.write("\n]")
+
+
+set_csv_engine(os.environ.get(CSV_ENGINE_ENV_VAR) or None)
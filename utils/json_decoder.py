@@ -0,0 +1,172 @@
+import os
+import json
+import codecs
+from utils.run_report import record_file_read
+
+# Optional accelerated decoders, fastest first; stdlib json is always available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# Optional incremental parser for iter_json_array; a raw_decode loop is used without it
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+BACKENDS = {}
+if orjson is not None:
+    BACKENDS["orjson"] = orjson.loads
+if simdjson is not None:
+    BACKENDS["simdjson"] = simdjson.loads
+if ujson is not None:
+    BACKENDS["ujson"] = ujson.loads
+BACKENDS["json"] = json.loads
+
+# Set to force a backend, including in process-pool workers
+BACKEND_ENV_VAR = "MERGER_JSON_BACKEND"
+
+_backend_name = None
+_loads = None
+
+
+def set_json_backend(name=None):
+    # None picks the fastest installed backend
+    global _backend_name, _loads
+    if name is None:
+        name = next(iter(BACKENDS))
+    if name not in BACKENDS:
+        raise ValueError(f"JSON backend {name!r} is not available (installed: {', '.join(BACKENDS)})")
+    _backend_name = name
+    _loads = BACKENDS[name]
+    return name
+
+
+def active_json_backend():
+    return _backend_name
+
+
+def decode_json(data):
+    try:
+        return _loads(data)
+    except ValueError:
+        if _loads is json.loads:
+            raise
+        # Accelerated backends are stricter (NaN literals, huge integers);
+        # let stdlib json have the final say
+        return json.loads(data)
+
+
+def fields_spec(*paths):
+    # "user.followers_count" style paths -> nested {key: sub-spec or None}
+    spec = {}
+    for path in paths:
+        node = spec
+        parts = path.split(".")
+        for part in parts[:-1]:
+            if part in node and node[part] is None:
+                break  # the whole parent is already kept
+            node = node.setdefault(part, {})
+        else:
+            node[parts[-1]] = None
+    return spec
+
+
+def project(obj, spec):
+    # Keeps only the keys in spec; lists are projected element-wise and
+    # values that are not dicts are kept as they are
+    if isinstance(obj, list):
+        return [project(item, spec) for item in obj]
+    if not isinstance(obj, dict):
+        return obj
+    return {
+        key: obj[key] if sub_spec is None else project(obj[key], sub_spec)
+        for key, sub_spec in spec.items()
+        if key in obj
+    }
+
+
+def read_json(filepath, fields=None):
+    # Reads the file as bytes and decodes it with the selected backend;
+    # fields (from fields_spec) drops everything the caller does not use
+    with open(filepath, "rb") as f:
+        data = f.read()
+    record_file_read(filepath, len(data))
+    obj = decode_json(data)
+    return project(obj, fields) if fields else obj
+
+
+JSON_WHITESPACE = " \t\r\n"
+
+
+def _iter_array_items(f, chunk_size):
+    # Incremental parse of a top-level array with stdlib raw_decode: only the
+    # unparsed tail of the file plus one item is held in memory
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer, pos, eof = "", 0, False
+    state = "start"  # start -> first -> separator <-> value
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in JSON_WHITESPACE:
+            pos += 1
+
+        if pos < len(buffer) and state in ("first", "value") and not (state == "first" and buffer[pos] == "]"):
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                end = None
+            # A value is only complete once a separator follows it, since the
+            # buffer may end inside a number ("-1" of "-1.5")
+            if end is not None and (eof or (end < len(buffer) and buffer[end] in JSON_WHITESPACE + ",]")):
+                yield item
+                pos = end
+                state = "separator"
+                continue
+        elif pos < len(buffer):
+            char = buffer[pos]
+            pos += 1
+            if state == "start" and char == "[":
+                state = "first"
+            elif state in ("first", "separator") and char == "]":
+                return
+            elif state == "separator" and char == ",":
+                state = "value"
+            else:
+                raise json.JSONDecodeError(f"Unexpected {char!r} in JSON array", buffer, pos - 1)
+            continue
+
+        if eof:
+            raise json.JSONDecodeError("Unterminated JSON array", buffer, pos)
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer, pos = buffer[pos:] + text.decode(chunk, final=eof), 0
+
+
+def iter_json_array(filepath, fields=None, chunk_size=1 << 16):
+    # Yields the items of a file holding one JSON array, one at a time, so
+    # memory is bounded by one item rather than the whole document
+    record_file_read(filepath)
+    with open(filepath, "rb") as f:
+        if ijson is not None:
+            items = ijson.items(f, "item", use_float=True)
+        else:
+            items = _iter_array_items(f, chunk_size)
+        for item in items:
+            yield project(item, fields) if fields else item
+
+
+set_json_backend(os.environ.get(BACKEND_ENV_VAR) or None)
@@ -0,0 +1,169 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pandas.util import hash_pandas_object
+from utils.json_decoder import decode_json
+
+# Sidecar of the JSONL output, written next to it as <output>.idx (Arrow IPC).
+# Row i holds record i's byte offset and length, dataset and post_id; the
+# key_hash / key_record columns are the same (dataset, post_id) keys sorted
+# by hash, so a lookup is a binary search over the memory-mapped file.
+INDEX_SUFFIX = ".idx"
+
+INDEX_SCHEMA = pa.schema([
+    ("offset", pa.uint64()),
+    ("length", pa.uint32()),
+    ("dataset", pa.string()),
+    ("post_id", pa.string()),
+    ("key_hash", pa.uint64()),
+    ("key_record", pa.int64()),
+])
+
+
+def index_path_for(output_path):
+    return output_path + INDEX_SUFFIX
+
+
+def key_hashes(datasets, post_ids):
+    keys = pd.DataFrame({"dataset": pd.Series(datasets, dtype="string"),
+                         "post_id": pd.Series(post_ids, dtype="string")})
+    return hash_pandas_object(keys, index=False).to_numpy()
+
+
+class JsonlIndexWriter:
+    # Collects each written dataset's line lengths (as returned by
+    # write_jsonl) in file order; write() stores the sidecar
+    def __init__(self):
+        self.lengths = []
+        self.datasets = []
+        self.post_ids = []
+
+    def add(self, dataset_name, post_ids, line_lengths):
+        if len(post_ids) != len(line_lengths):
+            raise ValueError(f"{dataset_name}: {len(post_ids)} post ids for {len(line_lengths)} lines")
+        self.lengths.append(np.asarray(line_lengths, dtype=np.uint32))
+        self.datasets.append(pd.Series(dataset_name, index=range(len(post_ids)), dtype="string"))
+        self.post_ids.append(pd.Series(post_ids, dtype="string").reset_index(drop=True))
+
+    def write(self, path):
+        lengths = np.concatenate(self.lengths) if self.lengths else np.empty(0, dtype=np.uint32)
+        offsets = np.zeros(len(lengths), dtype=np.uint64)
+        np.cumsum(lengths[:-1], out=offsets[1:])
+        datasets = pd.concat(self.datasets, ignore_index=True) if self.datasets else pd.Series([], dtype="string")
+        post_ids = pd.concat(self.post_ids, ignore_index=True) if self.post_ids else pd.Series([], dtype="string")
+
+        hashes = key_hashes(datasets, post_ids)
+        order = np.argsort(hashes, kind="stable")
+        table = pa.table({
+            "offset": offsets,
+            "length": lengths,
+            "dataset": pa.array(datasets, type=pa.string(), from_pandas=True),
+            "post_id": pa.array(post_ids, type=pa.string(), from_pandas=True),
+            "key_hash": hashes[order],
+            "key_record": order.astype(np.int64),
+        }, schema=INDEX_SCHEMA)
+
+        tmp_path = path + ".tmp"
+        with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, INDEX_SCHEMA) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, path)
+        return table.num_rows
+
+
+class JsonlReader:
+    # Random access into an uncompressed JSONL output through its sidecar
+    # index. Every run of consecutive records is fetched with a single
+    # os.pread, so reading a sample costs time in the sample's size, not
+    # the corpus's.
+    #
+    #     with JsonlReader("processed_data/final_dataset.jsonl") as reader:
+    #         batch = reader.records(np.random.permutation(len(reader))[:256])
+    #         post = reader.get("Pheme9", "552783667052167168")
+
+    def __init__(self, path, index_path=None):
+        self.path = path
+        self.index_source = pa.memory_map(index_path or index_path_for(path), "r")
+        index = pa.ipc.open_file(self.index_source).read_all()
+        # Zero-copy views into the mapped index; string columns stay in Arrow
+        self.offsets = index.column("offset").to_numpy()
+        self.lengths = index.column("length").to_numpy()
+        self.key_hash = index.column("key_hash").to_numpy()
+        self.key_record = index.column("key_record").to_numpy()
+        self.datasets = index.column("dataset")
+        self.post_ids = index.column("post_id")
+        self.file = open(path, "rb", buffering=0)
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _pread(self, size, offset):
+        if hasattr(os, "pread"):
+            return os.pread(self.file.fileno(), size, offset)
+        # No pread on Windows: seek and read under a lock instead
+        with self.lock:
+            self.file.seek(offset)
+            return self.file.read(size)
+
+    def _read_run(self, start, stop):
+        # Raw lines of records start:stop (consecutive) with one pread
+        offset = int(self.offsets[start])
+        size = int(self.offsets[stop - 1]) + int(self.lengths[stop - 1]) - offset
+        data = self._pread(size, offset)
+        bounds = np.concatenate([[0], np.cumsum(self.lengths[start:stop], dtype=np.int64)])
+        return [data[bounds[i]:bounds[i + 1]] for i in range(stop - start)]
+
+    def raw_records(self, indices):
+        # Undecoded lines of the given record numbers, in the order given
+        indices = np.asarray(indices, dtype=np.int64)
+        if len(indices) == 0:
+            return []
+        if indices.min() < 0 or indices.max() >= len(self):
+            raise IndexError(f"record numbers must be in [0, {len(self)})")
+
+        unique = np.unique(indices)
+        run_starts = np.flatnonzero(np.diff(unique) != 1) + 1
+        lines = {}
+        for run in np.split(unique, run_starts):
+            start, stop = int(run[0]), int(run[-1]) + 1
+            lines.update(zip(range(start, stop), self._read_run(start, stop)))
+        return [lines[i] for i in indices.tolist()]
+
+    def records(self, indices):
+        return [decode_json(line) for line in self.raw_records(indices)]
+
+    def record(self, index):
+        return self.records([index])[0]
+
+    def slice(self, start, stop):
+        stop = min(stop, len(self))
+        if start >= stop:
+            return []
+        return [decode_json(line) for line in self._read_run(start, stop)]
+
+    def lookup(self, dataset_name, post_id):
+        # Record numbers of (dataset, post_id), in file order; empty when absent
+        target = key_hashes([dataset_name], [str(post_id)])[0]
+        lo = np.searchsorted(self.key_hash, target, side="left")
+        hi = np.searchsorted(self.key_hash, target, side="right")
+        matches = [int(record) for record in self.key_record[lo:hi]
+                   if self.datasets[record].as_py() == dataset_name and self.post_ids[record].as_py() == str(post_id)]
+        return sorted(matches)
+
+    def get(self, dataset_name, post_id):
+        # The first record of (dataset, post_id), or None
+        matches = self.lookup(dataset_name, post_id)
+        return self.record(matches[0]) if matches else None
+
+    def close(self):
+        self.file.close()
+        self.index_source.close()
+
@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+
+# Unified fields every column_mapping names, in the order they are selected
+MAPPED_FIELDS = [
+    "post_id", "text", "timestamp", "label", "username",
+    "follower_count", "friends_count", "is_verified", "repost_count", "likes",
+]
+REPOST_FIELDS = ["post_id", "repost_text", "label"]
+
+# Value of a source column the loader did not produce, by source column name
+# (as update_fields did); a missing column without a default is an error
+SOURCE_DEFAULTS = {
+    "post_id": 0, "text": "", "timestamp": "", "label": 0, "username": "",
+    "follower_count": 0, "friends_count": 0, "is_verified": "", "repost_count": 0,
+    "likes": 0, "language": 0, "domain": 0, "platform": 0,
+}
+REPOST_SOURCE_DEFAULTS = {"post_id": "", "repost_text": ""}
+
+
+def _is_string_map(value):
+    return isinstance(value, dict) and all(isinstance(v, str) for v in value.values())
+
+
+def validate_mapping(dataset_name, mapping, has_reposts):
+    # Every problem with one dataset's entry, as messages
+    if not isinstance(mapping, dict):
+        return [f"{dataset_name}: entry must be an object"]
+    errors = []
+
+    column_mapping = mapping.get("column_mapping")
+    if not _is_string_map(column_mapping):
+        errors.append(f"{dataset_name}: column_mapping must map unified fields to source column names")
+    else:
+        missing = [field for field in MAPPED_FIELDS if field not in column_mapping]
+        if missing:
+            errors.append(f"{dataset_name}: column_mapping is missing {', '.join(missing)}")
+
+    if not _is_string_map(mapping.get("label_mapping", {})):
+        errors.append(f"{dataset_name}: label_mapping must map source labels to unified labels")
+
+    timestamp_format = mapping.get("timestamp_format")
+    if timestamp_format is not None and not isinstance(timestamp_format, str):
+        errors.append(f"{dataset_name}: timestamp_format must be a string")
+
+    repost_mapping = mapping.get("repost_mapping") or {}
+    if not _is_string_map(repost_mapping):
+        errors.append(f"{dataset_name}: repost_mapping must map repost fields to source column names")
+    elif has_reposts or repost_mapping:
+        missing = [field for field in REPOST_FIELDS if field not in repost_mapping]
+        if missing:
+            reason = "its loader returns reposts" if has_reposts else "it is not empty"
+            errors.append(f"{dataset_name}: repost_mapping is missing {', '.join(missing)} ({reason})")
+    return errors
+
+
+class MappingPlan:
+    # One dataset's mapping resolved into the source columns to take: rows
+    # are filtered with a single mask (dropna and label filter together) and
+    # the selected columns copied once, already under their unified names.
+    # project() returns the frame and its copy stats.
+
+    def __init__(self, dataset_name, mapping):
+        self.dataset_name = dataset_name
+        self.mapping = mapping
+        column_mapping = mapping["column_mapping"]
+        self.columns = [(field, column_mapping[field]) for field in MAPPED_FIELDS]
+        self.label_mapping = mapping.get("label_mapping") or {}
+        self.timestamp_format = mapping.get("timestamp_format")
+        repost_mapping = mapping.get("repost_mapping") or {}
+        self.repost_columns = [(field, repost_mapping[field]) for field in REPOST_FIELDS] if repost_mapping else None
+
+    def _resolve(self, df, columns, defaults):
+        # (field, source) pairs present in df, and (position, field, default) for the rest
+        present, filled = [], []
+        for position, (field, source) in enumerate(columns):
+            if source in df.columns:
+                present.append((field, source))
+            elif source in defaults:
+                filled.append((position, field, defaults[source]))
+            else:
+                raise KeyError(f"{self.dataset_name}: source column {source!r} for {field} not found "
+                               f"(columns: {', '.join(map(str, df.columns))})")
+        return present, filled
+
+    def _take(self, df, rows, present, filled, stats):
+        out = df.loc[rows, [source for _, source in present]]
+        out.columns = [field for field, _ in present]
+        stats["copies"] += 1
+        stats["bytes_allocated"] += int(out.memory_usage(index=False).sum())
+        for position, field, default in filled:
+            out.insert(position, field, default)
+            stats["bytes_allocated"] += int(out[field].memory_usage(index=False, deep=True))
+        return out
+
+    def project(self, df):
+        # Selected, renamed and filtered originals, with label and post_id cast
+        stats = {"copies": 0, "bytes_allocated": 0, "rows_dropped_dropna": 0, "rows_dropped_label": 0}
+        present, filled = self._resolve(df, self.columns, SOURCE_DEFAULTS)
+
+        # Defaults are never missing, so only present columns take part in dropna
+        keep = np.ones(len(df), dtype=bool)
+        for source in dict.fromkeys(source for _, source in present):
+            keep &= df[source].notna().to_numpy()
+        stats["rows_dropped_dropna"] = len(df) - int(keep.sum())
+
+        labels = None
+        if self.label_mapping:
+            defaults = {field: default for _, field, default in filled}
+            if "label" in defaults:
+                source_labels = pd.Series(defaults["label"], index=df.index)
+            else:
+                source_labels = df[dict(present)["label"]]
+            labels = source_labels[keep].astype(str)
+            stats["copies"] += 1
+            stats["bytes_allocated"] += int(labels.memory_usage(index=False, deep=True))
+            in_mapping = labels.isin(list(self.label_mapping)).to_numpy()
+            stats["rows_dropped_label"] = int(len(labels) - in_mapping.sum())
+            keep[keep] = in_mapping
+            labels = labels[in_mapping]
+
+        out = self._take(df, keep, present, filled, stats)
+
+        if labels is not None:
+            out["label"] = labels.str.strip().map(self.label_mapping)
+            stats["bytes_allocated"] += int(out["label"].memory_usage(index=False, deep=True))
+        out["post_id"] = out["post_id"].astype(str).str.strip()
+        stats["copies"] += 1
+        stats["bytes_allocated"] += int(out["post_id"].memory_usage(index=False, deep=True))
+        return out, stats
+
+    def project_reposts(self, df):
+        stats = {"copies": 0, "bytes_allocated": 0}
+        present, filled = self._resolve(df, self.repost_columns, REPOST_SOURCE_DEFAULTS)
+        return self._take(df, slice(None), present, filled, stats), stats
+
+
+def compile_mappings(mappings, datasets):
+    # {name: MappingPlan} for the selected datasets (registry entries), after
+    # validating all of them; every problem is reported in one ValueError
+    errors = []
+    for name, entry in datasets.items():
+        if name not in mappings:
+            errors.append(f"{name}: no entry in mappings.json")
+            continue
+        has_reposts = "combined_loader" in entry or "repost_loader" in entry
+        errors.extend(validate_mapping(name, mappings[name], has_reposts))
+    if errors:
+        raise ValueError("Invalid dataset mappings:\n  " + "\n  ".join(errors))
+    return {name: MappingPlan(name, mappings[name]) for name in datasets}
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+REPOST_FIELDS = ["repost_text", "label"]
+
+
+class RepostLists:
+    # Nested reposts column in Arrow layout: row i owns the child values
+    # offsets[i]:offsets[i + 1]. Children are kept as object arrays so labels
+    # of any type survive until they are written out.
+
+    def __init__(self, offsets, children):
+        self.offsets = offsets
+        self.children = children
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def total(self):
+        return int(self.offsets[-1])
+
+    @classmethod
+    def empty(cls, length):
+        return cls(np.zeros(length + 1, dtype=np.int64),
+                   {field: np.empty(0, dtype=object) for field in REPOST_FIELDS})
+
+    @classmethod
+    def concat(cls, parts):
+        parts = list(parts)
+        if not parts:
+            return cls.empty(0)
+        offsets = [parts[0].offsets]
+        base = parts[0].offsets[-1]
+        for part in parts[1:]:
+            offsets.append(part.offsets[1:] + base)
+            base += part.offsets[-1]
+        children = {
+            field: np.concatenate([part.children[field] for part in parts])
+            for field in REPOST_FIELDS
+        }
+        return cls(np.concatenate(offsets), children)
+
+    def slice(self, start, stop):
+        offsets = self.offsets[start:stop + 1]
+        lo, hi = offsets[0], offsets[-1]
+        return RepostLists(offsets - lo, {field: values[lo:hi] for field, values in self.children.items()})
+
+    def take(self, indices):
+        indices = np.asarray(indices, dtype=np.int64)
+        starts = self.offsets[indices]
+        lengths = self.offsets[indices + 1] - starts
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        child_index = _expand_ranges(starts, lengths, offsets)
+        return RepostLists(offsets, {field: values[child_index] for field, values in self.children.items()})
+
+    def to_records(self, start=0, stop=None):
+        # Materializes rows start:stop as lists of {repost_text, label} dicts
+        stop = len(self) if stop is None else stop
+        offsets = self.offsets[start:stop + 1]
+        lo, hi = offsets[0], offsets[-1]
+        texts = self.children["repost_text"][lo:hi].tolist()
+        labels = self.children["label"][lo:hi].tolist()
+        records = [{"repost_text": text, "label": label} for text, label in zip(texts, labels)]
+
+        result = np.empty(stop - start, dtype=object)
+        bounds = (offsets - lo).tolist()
+        for i in range(stop - start):
+            result[i] = records[bounds[i]:bounds[i + 1]]
+        return result
+
+    def to_arrow(self):
+        # list<struct<repost_text, label>>; labels are stored as strings
+        # when the datasets disagree on their type
+        text = pa.array(self.children["repost_text"], type=pa.string(), from_pandas=True)
+        try:
+            label = pa.array(self.children["label"], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            label = pa.array(pd.Series(self.children["label"]).astype(str), type=pa.string())
+        if pa.types.is_null(label.type):
+            label = label.cast(pa.string())
+        struct = pa.StructArray.from_arrays([text, label], names=REPOST_FIELDS)
+        if self.total < 2**31:
+            return pa.ListArray.from_arrays(pa.array(self.offsets, type=pa.int32()), struct)
+        return pa.LargeListArray.from_arrays(pa.array(self.offsets, type=pa.int64()), struct)
+
+
+def _expand_ranges(starts, lengths, offsets):
+    # Concatenation of range(starts[i], starts[i] + lengths[i]) without a Python loop
+    total = int(offsets[-1])
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    return np.repeat(starts - offsets[:-1], lengths) + np.arange(total, dtype=np.int64)
+
+
+def build_repost_lists(post_ids, reposts):
+    # Sort-plus-offsets join: reposts are ordered by the original they belong
+    # to (stable, so each original keeps its repost order) and every original
+    # gets the matching contiguous range
+    if reposts is not None:
+        reposts = reposts[reposts["post_id"].notna()]
+    if reposts is None or reposts.empty:
+        return RepostLists.empty(len(post_ids))
+
+    codes, uniques = pd.factorize(pd.concat([pd.Series(post_ids), reposts["post_id"]], ignore_index=True))
+    original_codes = codes[:len(post_ids)]
+    repost_codes = codes[len(post_ids):]
+
+    order = np.argsort(repost_codes, kind="stable")
+    counts = np.bincount(repost_codes, minlength=len(uniques))
+    group_starts = np.zeros(len(uniques), dtype=np.int64)
+    np.cumsum(counts[:-1], out=group_starts[1:])
+
+    starts = group_starts[original_codes]
+    lengths = counts[original_codes]
+    offsets = np.zeros(len(post_ids) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    child_index = order[_expand_ranges(starts, lengths, offsets)]
+    children = {field: reposts[field].to_numpy(dtype=object)[child_index] for field in REPOST_FIELDS}
+    return RepostLists(offsets, children)
@@ -0,0 +1,120 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from utils.json_decoder import read_json
+from utils.run_report import current_metrics, activate
+
+# Set to size the file-reading pool, including in process-pool workers;
+# 1 reads every file on the calling thread
+READ_WORKERS_ENV_VAR = "MERGER_READ_WORKERS"
+
+# Files handed to a worker at a time
+READ_CHUNK_SIZE = 64
+
+_read_workers = None
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def set_read_workers(workers=None):
+    # None picks the ThreadPoolExecutor default; the pool is shared by every
+    # loader in the process, so the total number of open reads stays bounded
+    # however many datasets run at once
+    global _read_workers, _pool
+    workers = int(workers) if workers is not None else min(32, (os.cpu_count() or 1) + 4)
+    if workers < 1:
+        raise ValueError(f"read workers must be at least 1, got {workers}")
+    with _pool_lock:
+        if _pool is not None and workers != _read_workers:
+            _pool.shutdown(wait=False)
+            _pool = None
+        _read_workers = workers
+    return workers
+
+
+def active_read_workers():
+    return _read_workers
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=_read_workers, thread_name_prefix="reader")
+        return _pool
+
+
+def _reset_after_fork():
+    # A forked process-pool worker inherits _pool but none of its threads, so
+    # work submitted to it would never run; the child builds its own pool
+    global _pool, _pool_lock
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+def _run_chunk(func, items, metrics):
+    # Per-item errors are returned rather than raised so one bad file does not
+    # lose the rest of the chunk; metrics keeps file counts on the caller's dataset
+    results = []
+    with activate(metrics):
+        for item in items:
+            try:
+                results.append((func(item), None))
+            except Exception as e:
+                results.append((None, e))
+    return results
+
+
+def map_ordered(func, items, chunk_size=READ_CHUNK_SIZE):
+    # Yields (result, error) for every item, in input order, with at most two
+    # chunks per worker in flight
+    items = list(items)
+    metrics = current_metrics()
+    chunks = [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+
+    if _read_workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield from _run_chunk(func, chunk, metrics)
+        return
+
+    pool = _get_pool()
+    pending = deque()
+    chunks = iter(chunks)
+    for chunk in chunks:
+        pending.append(pool.submit(_run_chunk, func, chunk, metrics))
+        if len(pending) >= 2 * _read_workers:
+            break
+
+    while pending:
+        results = pending.popleft().result()
+        chunk = next(chunks, None)
+        if chunk is not None:
+            pending.append(pool.submit(_run_chunk, func, chunk, metrics))
+        yield from results
+
+
+def _read_json_item(item):
+    path, fields = item
+    return read_json(path, fields)
+
+
+def read_json_items(items, chunk_size=READ_CHUNK_SIZE):
+    # items are (path, fields) pairs, so one batch can mix projections;
+    # yields (data, error) in the same order
+    return map_ordered(_read_json_item, items, chunk_size)
+
+
+def read_json_files(paths, fields=None, chunk_size=READ_CHUNK_SIZE):
+    # Yields (path, data, error) in the order of paths; fields is a fields_spec
+    # projection applied to every file
+    paths = list(paths)
+    results = read_json_items([(path, fields) for path in paths], chunk_size)
+    for path, (data, error) in zip(paths, results):
+        yield path, data, error
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+set_read_workers(os.environ.get(READ_WORKERS_ENV_VAR) or None)
@@ -0,0 +1,122 @@
+import os
+import shutil
+from contextlib import contextmanager
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from utils.nested_reposts import RepostLists
+
+PARTITION_COLUMNS = ["platform", "dataset"]
+PARTITIONING = ds.partitioning(pa.schema([("platform", pa.string()), ("dataset", pa.string())]), flavor="hive")
+
+REPOST_TYPE = pa.list_(pa.struct([
+    ("repost_text", pa.string()),
+    ("label", pa.string()),
+]))
+
+# Every partition is written with the same schema so the dataset reads as one table
+PARQUET_SCHEMA = pa.schema([
+    ("post_id", pa.string()),
+    ("text", pa.string()),
+    ("timestamp", pa.timestamp("ns", tz="UTC")),
+    ("label", pa.string()),
+    ("username", pa.string()),
+    ("follower_count", pa.int64()),
+    ("friends_count", pa.int64()),
+    ("is_verified", pa.bool_()),
+    ("repost_count", pa.int64()),
+    ("likes", pa.int64()),
+    ("language", pa.string()),
+    ("domain", pa.string()),
+    ("platform", pa.string()),
+    ("dataset", pa.string()),
+    ("reposts", REPOST_TYPE),
+])
+
+
+def _column_to_arrow(name, values):
+    field = PARQUET_SCHEMA.field(name)
+    if pa.types.is_timestamp(field.type) and values.dtype == object:
+        # Mixed naive / tz-aware timestamps: naive ones are taken as UTC
+        values = pd.to_datetime(values, utc=True, errors="coerce")
+    try:
+        array = pa.array(values, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        array = pa.array(values.astype(str), type=pa.string())
+    if pa.types.is_string(field.type) and not pa.types.is_string(array.type):
+        # Avoid Arrow's float formatting for integer-like values stored as float
+        return pa.array(values.map(lambda v: None if pd.isna(v) else str(v)), type=pa.string())
+    return array.cast(field.type, safe=False)
+
+
+def originals_to_table(originals, reposts, dataset_name):
+    # Arrow table in PARQUET_SCHEMA layout with the nested reposts column
+    if reposts is None:
+        reposts = RepostLists.empty(len(originals))
+
+    columns = {}
+    for field in PARQUET_SCHEMA:
+        if field.name == "dataset":
+            columns["dataset"] = pa.array([dataset_name] * len(originals), type=pa.string())
+        elif field.name == "reposts":
+            columns["reposts"] = reposts.to_arrow().cast(REPOST_TYPE)
+        else:
+            columns[field.name] = _column_to_arrow(field.name, originals[field.name].reset_index(drop=True))
+    return pa.table(columns, schema=PARQUET_SCHEMA)
+
+
+def write_parquet_partition(originals, reposts, root, dataset_name):
+    # Writes (or replaces) the platform=<..>/dataset=<..> partition of one dataset
+    table = originals_to_table(originals, reposts, dataset_name)
+    pq.write_to_dataset(
+        table,
+        root,
+        partition_cols=PARTITION_COLUMNS,
+        existing_data_behavior="delete_matching",
+        basename_template="part-{i}.parquet",
+    )
+    return table.num_rows
+
+
+@contextmanager
+def open_parquet_output(root):
+    # Yields write(originals, reposts, dataset_name) -> rows written, each
+    # call adding one dataset's partition to a fresh directory that replaces
+    # root once the run completes; partitions of datasets left out of this
+    # run (or emptied by dedup) therefore never survive from an earlier one
+    tmp_root = root + ".tmp"
+    shutil.rmtree(tmp_root, ignore_errors=True)
+    os.makedirs(tmp_root)
+    try:
+        yield lambda originals, reposts, dataset_name: write_parquet_partition(
+            originals, reposts, tmp_root, dataset_name)
+    except BaseException:
+        shutil.rmtree(tmp_root, ignore_errors=True)
+        raise
+
+    old_root = root + ".old"
+    shutil.rmtree(old_root, ignore_errors=True)
+    if os.path.exists(root):
+        os.replace(root, old_root)
+    os.replace(tmp_root, root)
+    shutil.rmtree(old_root, ignore_errors=True)
+
+
+def read_merged_parquet(root, columns=None, platforms=None, datasets=None, as_arrow=False):
+    # Reads only the requested columns from the matching partitions; the
+    # platform / dataset filters are resolved from directory names, so
+    # non-matching partitions are never opened
+    dataset = ds.dataset(root, format="parquet", partitioning=PARTITIONING, schema=PARQUET_SCHEMA)
+
+    expression = None
+    for field, values in (("platform", platforms), ("dataset", datasets)):
+        if values is None:
+            continue
+        if isinstance(values, str):
+            values = [values]
+        condition = ds.field(field).isin(list(values))
+        expression = condition if expression is None else expression & condition
+
+    table = dataset.to_table(columns=columns, filter=expression)
+    return table if as_arrow else table.to_pandas()
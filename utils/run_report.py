@@ -0,0 +1,146 @@
+import os
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# resource is POSIX only; without it peak RSS is reported as None
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Per-dataset counters; every stage also records how much each one grew while it ran
+COUNTERS = ["files_read", "bytes_read", "rows_dropped_dropna", "rows_dropped_label", "rows_dropped_duplicate"]
+
+_local = threading.local()
+
+
+def peak_rss():
+    # High-water mark of the whole process in bytes, so in thread mode it
+    # covers every dataset running at the same time
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class DatasetMetrics:
+    def __init__(self, name):
+        self.name = name
+        self.stages = {}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.info = {}
+
+    def add(self, counter, amount=1):
+        self.counters[counter] += amount
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        # Yields the stage record so the caller can fill in rows_out; CPU time
+        # is per thread, so concurrent datasets do not inflate each other
+        record = {"rows_in": rows_in, "rows_out": None}
+        counters_before = dict(self.counters)
+        start_wall, start_cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield record
+        finally:
+            record["wall_s"] = round(time.perf_counter() - start_wall, 4)
+            record["cpu_s"] = round(time.thread_time() - start_cpu, 4)
+            for counter in COUNTERS:
+                record[counter] = self.counters[counter] - counters_before[counter]
+            record["peak_rss_bytes"] = peak_rss()
+            self.stages[name] = record
+
+    def to_dict(self):
+        return {
+            "stages": self.stages,
+            "counters": self.counters,
+            "total_wall_s": round(sum(stage["wall_s"] for stage in self.stages.values()), 4),
+            **self.info,
+        }
+
+
+class RunReport:
+    def __init__(self, **info):
+        self.info = {"started_at": datetime.now(timezone.utc).isoformat(), **info}
+        self.datasets = {}
+
+    def dataset(self, name):
+        if name not in self.datasets:
+            self.datasets[name] = DatasetMetrics(name)
+        return self.datasets[name]
+
+    def add_dataset(self, metrics):
+        # Metrics collected in a process-pool worker replace the local placeholder
+        self.datasets[metrics.name] = metrics
+
+    def slowest_stages(self, count=5):
+        stages = [
+            (stage["wall_s"], name, stage_name)
+            for name, metrics in self.datasets.items()
+            for stage_name, stage in metrics.stages.items()
+        ]
+        return sorted(stages, reverse=True)[:count]
+
+    def to_dict(self):
+        return {
+            **self.info,
+            "peak_rss_bytes": peak_rss(),
+            "datasets": {name: metrics.to_dict() for name, metrics in self.datasets.items()},
+            "slowest_stages": [
+                {"dataset": name, "stage": stage_name, "wall_s": wall}
+                for wall, name, stage_name in self.slowest_stages()
+            ],
+        }
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+def current_metrics():
+    return getattr(_local, "metrics", None)
+
+
+@contextmanager
+def activate(metrics):
+    # Makes metrics the target of stage() and the counters below for code
+    # running on this thread
+    previous = current_metrics()
+    _local.metrics = metrics
+    try:
+        yield metrics
+    finally:
+        _local.metrics = previous
+
+
+@contextmanager
+def stage(name, rows_in=None):
+    metrics = current_metrics()
+    if metrics is None:
+        yield {}
+        return
+    with metrics.stage(name, rows_in) as record:
+        yield record
+
+
+def add_count(counter, amount=1):
+    metrics = current_metrics()
+    if metrics is not None:
+        metrics.add(counter, amount)
+
+
+def record_file_read(path, num_bytes=None):
+    metrics = current_metrics()
+    if metrics is None:
+        return
+    if num_bytes is None:
+        try:
+            num_bytes = os.path.getsize(path)
+        except OSError:
+            num_bytes = 0
+    metrics.add("files_read")
+    metrics.add("bytes_read", num_bytes)
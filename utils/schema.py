@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+# Target dtypes of the unified record layout. "count" columns are downcast
+# to the smallest nullable integer type that holds their values.
+UNIFIED_SCHEMA = {
+    "post_id": "string",
+    "text": "string",
+    "timestamp": "timestamp",
+    "label": "category",
+    "username": "string",
+    "follower_count": "count",
+    "friends_count": "count",
+    "is_verified": "boolean",
+    "repost_count": "count",
+    "likes": "count",
+    "language": "category",
+    "domain": "category",
+    "platform": "category",
+}
+
+REPOST_SCHEMA = {
+    "post_id": "string",
+    "repost_text": "string",
+    "label": "category",
+}
+
+FALSE_STRINGS = {"", "false", "0", "0.0", "no", "n", "none", "nan", "null"}
+
+INTEGER_TYPES = [("Int8", np.int8), ("Int16", np.int16), ("Int32", np.int32), ("Int64", np.int64)]
+
+
+def _to_count(values):
+    numeric = pd.to_numeric(values, errors="coerce")
+    present = numeric.dropna()
+    if not present.empty and not (present == np.floor(present)).all():
+        return numeric.astype("Float64")  # non-integral counts are kept as floats
+    if present.empty:
+        return numeric.astype("Int8")
+
+    low, high = present.min(), present.max()
+    for dtype, np_type in INTEGER_TYPES:
+        info = np.iinfo(np_type)
+        if info.min <= low and high <= info.max:
+            return numeric.astype(dtype)
+    return numeric.astype("Float64")
+
+
+def _to_boolean(values):
+    # Like bool(value) for real booleans, numbers and free text, except that
+    # empty or false-looking strings are False and missing values stay missing
+    if pd.api.types.is_bool_dtype(values):
+        return values.astype("boolean")
+
+    def convert(value):
+        if value is None or value is pd.NA or (isinstance(value, float) and np.isnan(value)):
+            return pd.NA
+        if isinstance(value, str):
+            return value.strip().lower() not in FALSE_STRINGS
+        return bool(value)
+
+    return values.map(convert).astype("boolean")
+
+
+def _to_timestamp(values):
+    if isinstance(values.dtype, pd.DatetimeTZDtype):
+        return values.dt.tz_convert("UTC")
+    # Naive values are taken as UTC, which keeps the epoch values written out
+    return pd.to_datetime(values, utc=True, errors="coerce")
+
+
+def _convert(values, kind):
+    if kind == "string":
+        return values.astype("string")
+    if kind == "category":
+        return values.astype("category")
+    if kind == "count":
+        return _to_count(values)
+    if kind == "boolean":
+        return _to_boolean(values)
+    if kind == "timestamp":
+        return _to_timestamp(values)
+    raise ValueError(f"Unknown schema type: {kind}")
+
+
+def memory_usage(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+def enforce_schema(df, schema=UNIFIED_SCHEMA):
+    # Returns a copy with every schema column converted, in schema order
+    return pd.DataFrame({column: _convert(df[column], kind) for column, kind in schema.items()}, index=df.index)
+
+
+def format_bytes(num_bytes):
+    for unit in ["B", "KB", "MB", "GB"]:
+        if abs(num_bytes) < 1024 or unit == "GB":
+            return f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
@@ -0,0 +1,140 @@
+import os
+import shutil
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pandas.util import hash_pandas_object
+from utils.nested_reposts import RepostLists, REPOST_FIELDS, _expand_ranges
+from utils.dedup import MISSING_IDS
+
+# Column tagging every spilled row with its dataset; dropped before output
+SOURCE_COLUMN = "_dataset"
+
+
+def shard_of(post_ids, num_shards):
+    # Stable across runs and processes, unlike hash(); every original and
+    # repost with the same post_id lands in the same shard, and so does every
+    # record without a real id, so record_keys duplicates always meet
+    post_ids = post_ids.astype("string").str.strip().reset_index(drop=True)
+    post_ids = post_ids.mask(post_ids.isna() | post_ids.str.lower().isin(MISSING_IDS), "")
+    keys = hash_pandas_object(post_ids, index=False).to_numpy()
+    return (keys % np.uint64(num_shards)).astype(np.int64)
+
+
+def _write_piece(path, df):
+    # Arrow IPC file, like pack_frame; frames Arrow cannot hold are pickled
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        df.to_pickle(path + ".pkl")
+        return path + ".pkl"
+    with pa.OSFile(path + ".arrow", "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return path + ".arrow"
+
+
+def _read_piece(path):
+    if path.endswith(".pkl"):
+        return pd.read_pickle(path)
+    with pa.memory_map(path) as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+
+class ShardStore:
+    # On-disk spill of every dataset's originals and reposts, partitioned by
+    # post_id hash. Each add() writes one piece per non-empty shard, so a
+    # shard is read back as the concatenation of its pieces in arrival order;
+    # rows carry their dataset in SOURCE_COLUMN.
+    def __init__(self, root, num_shards):
+        if num_shards < 1:
+            raise ValueError(f"shards must be at least 1, got {num_shards}")
+        self.root = root
+        self.num_shards = num_shards
+        self.pieces = 0
+        self.bytes_written = 0
+        shutil.rmtree(root, ignore_errors=True)
+        os.makedirs(root)
+
+    def _shard_dir(self, shard):
+        return os.path.join(self.root, f"shard-{shard:05d}")
+
+    def _spill(self, kind, df):
+        if df is None or df.empty:
+            return
+        df = df.reset_index(drop=True)
+        shards = shard_of(df["post_id"], self.num_shards)
+        order = np.argsort(shards, kind="stable")
+        bounds = np.searchsorted(shards[order], np.arange(self.num_shards + 1))
+
+        for shard in np.flatnonzero(np.diff(bounds)):
+            shard_dir = self._shard_dir(shard)
+            os.makedirs(shard_dir, exist_ok=True)
+            path = os.path.join(shard_dir, f"{kind}-{self.pieces:05d}")
+            path = _write_piece(path, df.take(order[bounds[shard]:bounds[shard + 1]]))
+            self.bytes_written += os.path.getsize(path)
+        self.pieces += 1
+
+    def add(self, dataset_name, originals, reposts=None):
+        # Reposts without a post_id can never be attached, so they are not kept
+        self._spill("originals", originals.assign(**{SOURCE_COLUMN: dataset_name}))
+        if reposts is not None:
+            reposts = reposts[reposts["post_id"].notna()]
+            self._spill("reposts", reposts.assign(**{SOURCE_COLUMN: dataset_name}))
+
+    def read_shard(self, shard):
+        # (originals, reposts) of one shard; either is None when it has no rows
+        shard_dir = self._shard_dir(shard)
+        try:
+            names = sorted(os.listdir(shard_dir))
+        except FileNotFoundError:
+            return None, None
+
+        frames = {"originals": [], "reposts": []}
+        for name in names:
+            frames[name.split("-")[0]].append(_read_piece(os.path.join(shard_dir, name)))
+        return tuple(pd.concat(parts, ignore_index=True) if parts else None
+                     for parts in (frames["originals"], frames["reposts"]))
+
+    def iter_shards(self):
+        # Yields (shard, originals, reposts) for every shard holding originals
+        for shard in range(self.num_shards):
+            originals, reposts = self.read_shard(shard)
+            if originals is not None:
+                yield shard, originals, reposts
+
+    def cleanup(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def sort_merge_reposts(post_ids, reposts):
+    # Sort-merge join of one shard: both sides are sorted by post_id (stably,
+    # so reposts keep their arrival order within an original) and each
+    # original's matching run of reposts is found by a merge over the sorted
+    # keys; same result as build_repost_lists, rows in post_ids order
+    if reposts is None or reposts.empty:
+        return RepostLists.empty(len(post_ids))
+
+    post_ids = pd.Series(post_ids).astype("string")
+    missing = post_ids.isna().to_numpy()
+    original_keys = post_ids.to_numpy(dtype=object, na_value="")
+    repost_keys = reposts["post_id"].astype("string").to_numpy(dtype=object)
+
+    repost_order = np.argsort(repost_keys, kind="stable")
+    sorted_reposts = repost_keys[repost_order]
+    original_order = np.argsort(original_keys, kind="stable")
+    sorted_originals = original_keys[original_order]
+
+    starts = np.empty(len(post_ids), dtype=np.int64)
+    ends = np.empty(len(post_ids), dtype=np.int64)
+    starts[original_order] = np.searchsorted(sorted_reposts, sorted_originals, side="left")
+    ends[original_order] = np.searchsorted(sorted_reposts, sorted_originals, side="right")
+    # A missing original id matches nothing
+    ends[missing] = starts[missing]
+
+    lengths = ends - starts
+    offsets = np.zeros(len(post_ids) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    child_index = repost_order[_expand_ranges(starts, lengths, offsets)]
+    children = {field: reposts[field].to_numpy(dtype=object)[child_index] for field in REPOST_FIELDS}
+    return RepostLists(offsets, children)
@@ -0,0 +1,226 @@
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+# Pre-aggregated summaries of the merged output, written next to it as
+# stats_cube.arrow while the datasets stream past, so the EDA notebook and
+# dashboards never have to read the corpus. One row per (dataset, label,
+# platform, kind, field, key) with its count; every kind is additive, so any
+# roll-up over the dimensions is a sum:
+#   count      records / reposts attached to them in the output (key "")
+#   missing    records missing a SKETCH_FIELDS value (key "")
+#   category   records per value of language, domain, is_verified
+#   histogram  records per month of timestamp ("2015-01", MISSING_KEY for
+#              none) and per text_length bin (lower edge of TEXT_LENGTH_BINS)
+#   sketch     records per log bucket of a numeric field; quantiles from it
+#              are within SKETCH_ACCURACY relative error of value + 1
+STATS_FILENAME = "stats_cube.arrow"
+
+DIMENSIONS = ["dataset", "label", "platform"]
+CATEGORY_FIELDS = ["language", "domain", "is_verified"]
+SKETCH_FIELDS = ["text_length", "follower_count", "friends_count", "repost_count", "likes", "reposts"]
+TEXT_LENGTH_BINS = [0, 1, 20, 40, 80, 140, 280, 560, 1120]
+SKETCH_ACCURACY = 0.01
+MISSING_KEY = "<NA>"
+
+STATS_SCHEMA = pa.schema([
+    ("dataset", pa.string()),
+    ("label", pa.string()),
+    ("platform", pa.string()),
+    ("kind", pa.string()),
+    ("field", pa.string()),
+    ("key", pa.string()),
+    ("value", pa.int64()),
+])
+
+_GAMMA = (1 + SKETCH_ACCURACY) / (1 - SKETCH_ACCURACY)
+
+
+def stats_path_for(output_path):
+    return os.path.join(os.path.dirname(output_path), STATS_FILENAME)
+
+
+def sketch_buckets(values):
+    # Log bucket of value + 1 for non-negative values (negatives count as 0)
+    values = np.clip(np.asarray(values, dtype=np.float64), 0, None)
+    return np.ceil(np.log1p(values) / np.log(_GAMMA)).astype(np.int64)
+
+
+def sketch_values(buckets):
+    # Representative value of each bucket, within SKETCH_ACCURACY of value + 1
+    return np.maximum(2 * _GAMMA ** np.asarray(buckets, dtype=np.float64) / (_GAMMA + 1) - 1, 0)
+
+
+def _keys(values):
+    return values.astype("string").fillna(MISSING_KEY)
+
+
+def _month_keys(timestamps):
+    timestamps = pd.to_datetime(timestamps, utc=True, errors="coerce")
+    months = (timestamps.dt.year * 100 + timestamps.dt.month).astype("Int64")
+    codes, uniques = pd.factorize(months)
+    labels = np.array([f"{month // 100:04d}-{month % 100:02d}" for month in uniques] + [MISSING_KEY], dtype=object)
+    return pd.Series(labels[codes], index=timestamps.index, dtype="string")
+
+
+class StatsCubeWriter:
+    # Folds each dataset's final originals, with the RepostLists attached to
+    # them in the output, into grouped counts as they are written; write()
+    # stores the cube. Only the aggregates are kept, never the records.
+    def __init__(self):
+        self.parts = []
+
+    def _count(self, groups, kind, field, keys):
+        frame = groups.assign(key=keys.to_numpy())
+        counts = frame.groupby(DIMENSIONS + ["key"], sort=False, observed=True).size()
+        counts = counts.rename("value").reset_index()
+        counts.insert(3, "kind", kind)
+        counts.insert(4, "field", field)
+        self.parts.append(counts)
+
+    def add(self, dataset_name, originals, repost_lists=None):
+        if len(originals) == 0:
+            return
+        groups = pd.DataFrame({
+            "dataset": dataset_name,
+            "label": _keys(originals["label"]).to_numpy(),
+            "platform": _keys(originals["platform"]).to_numpy(),
+        })
+        empty = pd.Series("", index=groups.index, dtype="string")
+        self._count(groups, "count", "records", empty)
+
+        repost_counts = pd.Series(0, index=groups.index, dtype="int64")
+        if repost_lists is not None and repost_lists.total:
+            repost_counts = pd.Series(np.diff(repost_lists.offsets), index=groups.index, dtype="int64")
+            total = groups.assign(value=repost_counts).groupby(DIMENSIONS, sort=False, observed=True)["value"].sum()
+            total = total.reset_index()
+            total.insert(3, "kind", "count")
+            total.insert(4, "field", "reposts")
+            total.insert(5, "key", "")
+            self.parts.append(total)
+
+        for field in CATEGORY_FIELDS:
+            self._count(groups, "category", field, _keys(originals[field]))
+
+        self._count(groups, "histogram", "timestamp", _month_keys(originals["timestamp"]))
+        text_length = originals["text"].astype("string").str.len()
+        bins = np.searchsorted(TEXT_LENGTH_BINS, text_length.fillna(0).to_numpy(), side="right") - 1
+        self._count(groups, "histogram", "text_length",
+                    pd.Series(np.array(TEXT_LENGTH_BINS)[bins]).astype("string"))
+
+        measures = {
+            "text_length": text_length,
+            "follower_count": originals["follower_count"],
+            "friends_count": originals["friends_count"],
+            "repost_count": originals["repost_count"],
+            "likes": originals["likes"],
+            "reposts": repost_counts,
+        }
+        for field, values in measures.items():
+            values = pd.to_numeric(pd.Series(values).reset_index(drop=True), errors="coerce").astype("Float64")
+            present = values.notna().to_numpy()
+            missing = int((~present).sum())
+            if missing:
+                self._count(groups[~present], "missing", field, empty[~present])
+            if present.any():
+                buckets = sketch_buckets(values[present].to_numpy(dtype=np.float64))
+                self._count(groups[present], "sketch", field, pd.Series(buckets).astype("string"))
+
+    def table(self):
+        if not self.parts:
+            return STATS_SCHEMA.empty_table()
+        cube = pd.concat(self.parts, ignore_index=True)
+        cube = cube.groupby(STATS_SCHEMA.names[:-1], sort=True, observed=True)["value"].sum().reset_index()
+        return pa.Table.from_pandas(cube.astype({"value": "int64"}), schema=STATS_SCHEMA, preserve_index=False)
+
+    def write(self, path):
+        table = self.table()
+        tmp_path = path + ".tmp"
+        with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, STATS_SCHEMA) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, path)
+        return table.num_rows
+
+
+class StatsCube:
+    # Summaries from a cube written by StatsCubeWriter. Every query sums over
+    # the dimensions not in by, after keeping only the rows matching where
+    # (a dimension -> value or list of values mapping).
+    #
+    #     cube = StatsCube("processed_data/stats_cube.arrow")
+    #     cube.counts(by=["dataset", "label"])
+    #     cube.categories("language", by=["platform"])
+    #     cube.histogram("timestamp", where={"dataset": "Pheme9"})
+    #     cube.quantiles("likes", [0.5, 0.9, 0.99], by=["label"])
+
+    def __init__(self, path):
+        with pa.memory_map(path, "r") as source:
+            self.frame = pa.ipc.open_file(source).read_all().to_pandas()
+        for column in DIMENSIONS + ["kind", "field"]:
+            self.frame[column] = self.frame[column].astype("category")
+
+    def _select(self, kind, field=None, where=None):
+        rows = self.frame["kind"] == kind
+        if field is not None:
+            rows &= self.frame["field"] == field
+        for dimension, value in (where or {}).items():
+            if dimension not in DIMENSIONS:
+                raise ValueError(f"Unknown dimension {dimension!r} (choose from {', '.join(DIMENSIONS)})")
+            values = [value] if isinstance(value, str) else list(value)
+            rows &= self.frame[dimension].isin(values)
+        return self.frame[rows]
+
+    def _total(self, rows, by, columns):
+        # Sum of value per columns key, or a by x columns table
+        if not by:
+            return rows.groupby(columns, observed=True)["value"].sum().astype("int64")
+        table = rows.pivot_table(index=list(by), columns=columns, values="value", aggfunc="sum",
+                                 fill_value=0, observed=True)
+        table.columns.name = None
+        return table.astype("int64")
+
+    def dimension_values(self, dimension):
+        return sorted(self.frame[dimension].unique())
+
+    def counts(self, by=None, where=None):
+        # records and reposts per group
+        return self._total(self._select("count", where=where), by, "field")
+
+    def missing(self, by=None, where=None):
+        # Records missing each SKETCH_FIELDS value
+        return self._total(self._select("missing", where=where), by, "field")
+
+    def categories(self, field, by=None, where=None):
+        # Records per value of a CATEGORY_FIELDS field, one column per value
+        return self._total(self._select("category", field, where), by, "key")
+
+    def histogram(self, field, by=None, where=None):
+        # Records per month ("timestamp") or text_length bin, in key order;
+        # missing timestamps are under MISSING_KEY
+        rows = self._select("histogram", field, where)
+        if field == "text_length":
+            rows = rows.assign(key=rows["key"].astype("int64"))
+        return self._total(rows, by, "key").sort_index(axis=1 if by else 0)
+
+    def quantiles(self, field, q=(0.5, 0.9, 0.99), by=None, where=None):
+        # Estimated quantiles of a SKETCH_FIELDS field per group, from the
+        # merged sketches of the group's cells
+        rows = self._select("sketch", field, where)
+        rows = rows.assign(bucket=rows["key"].astype("int64"))
+        by = list(by or [])
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+
+        def estimate(group):
+            counts = group.groupby("bucket")["value"].sum().sort_index()
+            cumulative = counts.to_numpy().cumsum()
+            ranks = q * (cumulative[-1] - 1)
+            positions = np.searchsorted(cumulative, ranks, side="right")
+            return pd.Series(sketch_values(counts.index.to_numpy()[positions]), index=q)
+
+        if not by:
+            return estimate(rows) if len(rows) else pd.Series(np.nan, index=q)
+        result = {key: estimate(group) for key, group in rows.groupby(by, observed=True)}
+        result = pd.DataFrame(result).T
+        result.index.names = by
+        return result
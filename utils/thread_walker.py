@@ -0,0 +1,347 @@
+import os
+import pandas as pd
+from utils.json_decoder import read_json, fields_spec
+from utils.parallel_reader import read_json_items
+
+# On-disk layout of the PHEME-style thread trees. Each level is either any
+# sub-directory (None) or a fixed list of sub-directory names to visit in order.
+THREAD_LAYOUTS = {
+    "Pheme5": {
+        "prefix": None,
+        "levels": [("event", None), ("label", ["rumours", "non-rumours"])],
+        "source_dir": "source-tweet",
+        "reactions_dir": "reactions",
+    },
+    "Pheme9": {
+        "prefix": "threads",
+        "levels": [("lang", None), ("event", None)],
+        "source_dir": "source-tweets",
+        "reactions_dir": "reactions",
+    },
+    "Pheme-veracity": {
+        "prefix": None,
+        "levels": [("event", None), ("label", ["rumours", "non-rumours"])],
+        "source_dir": "source-tweets",
+        "reactions_dir": "reactions",
+    },
+    "RumorEval17": {
+        "prefix": "rumoureval-data",
+        "levels": [("event", None)],
+        "source_dir": "source-tweet",
+        "reactions_dir": "replies",
+    },
+    "RumorEval19": {
+        "prefix": None,
+        "levels": [("split", ["reddit-dev-data", "reddit-training-data", "twitter-english"]), ("event", None)],
+        "source_dir": "source-tweet",
+        "reactions_dir": "replies",
+    },
+}
+
+
+def _list_dirs(path):
+    try:
+        with os.scandir(path) as it:
+            return [(entry.name, entry.path) for entry in it if entry.is_dir()]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+def _list_json_files(path):
+    try:
+        with os.scandir(path) as it:
+            return [entry.path for entry in it
+                    if entry.name.endswith('.json') and not entry.name.startswith('.') and entry.is_file()]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+def _iter_level_dirs(path, allowed):
+    if allowed is None:
+        return _list_dirs(path)
+    # Fixed names are visited in the given order, one scandir for the parent
+    present = dict(_list_dirs(path))
+    return [(name, present[name]) for name in allowed if name in present]
+
+
+def _scan_thread(thread_path, layout):
+    source_dir = None
+    reactions_dir = None
+    annotation_file = None
+
+    with os.scandir(thread_path) as it:
+        for entry in it:
+            if entry.name == layout["source_dir"] and entry.is_dir():
+                source_dir = entry.path
+            elif entry.name == layout["reactions_dir"] and entry.is_dir():
+                reactions_dir = entry.path
+            elif entry.name == "annotation.json" and entry.is_file():
+                annotation_file = entry.path
+
+    return {
+        "source_files": _list_json_files(source_dir) if source_dir else [],
+        "reaction_files": _list_json_files(reactions_dir) if reactions_dir else [],
+        "annotation_file": annotation_file,
+    }
+
+
+def iter_threads(root, layout):
+    # Yields one dict per thread folder with the level names it was found under,
+    # its source tweet files, reaction files and annotation file (if any)
+    if isinstance(layout, str):
+        layout = THREAD_LAYOUTS[layout]
+
+    base = os.path.join(root, layout["prefix"]) if layout["prefix"] else root
+    levels = layout["levels"]
+
+    def walk(path, depth, context):
+        if depth == len(levels):
+            for thread_id, thread_path in _list_dirs(path):
+                thread = _scan_thread(thread_path, layout)
+                thread.update(context)
+                thread["thread_id"] = thread_id
+                thread["path"] = thread_path
+                yield thread
+            return
+
+        level_name, allowed = levels[depth]
+        for name, sub_path in _iter_level_dirs(path, allowed):
+            yield from walk(sub_path, depth + 1, {**context, level_name: name})
+
+    yield from walk(base, 0, {})
+
+
+# Keys the record builders below actually use
+TWEET_FIELDS = fields_spec(
+    "id", "id_str", "text", "created_at", "retweet_count", "favorite_count",
+    "user.name", "user.followers_count", "user.friends_count", "user.verified",
+)
+REPLY_FIELDS = fields_spec("text", "in_reply_to_status_id", "in_reply_to_status_id_str")
+
+
+def _load_rumoureval17_labels(root_path):
+    label_path = os.path.join(root_path, "traindev")
+    train_labels = read_json(os.path.join(label_path, "rumoureval-subtaskB-train.json"))
+    dev_labels = read_json(os.path.join(label_path, "rumoureval-subtaskB-dev.json"))
+    return {**train_labels, **dev_labels}
+
+
+def _load_rumoureval2019_labels(root_path):
+    train_labels = read_json(os.path.join(root_path, "train-key.json")).get("subtaskbenglish", {})
+    dev_labels = read_json(os.path.join(root_path, "dev-key.json")).get("subtaskbenglish", {})
+    return {**train_labels, **dev_labels}
+
+
+def _pheme_original_record(tweet, thread, labels):
+    user = tweet.get('user', {})
+    return {
+        'id': tweet.get('id'),
+        'text': tweet.get('text'),
+        'created_at': tweet.get('created_at'),
+        'label': thread["label"],
+        'followers_count': user.get('followers_count'),
+        'friends_count': user.get('friends_count'),
+        'verified': user.get('verified'),
+        'retweet_count': tweet.get('retweet_count'),
+        'favorite_count': tweet.get('favorite_count')
+    }
+
+
+def _pheme9_original_record(tweet, thread, labels):
+    return {
+        "id": tweet.get("id_str", tweet.get("id")),
+        "text": tweet.get("text"),
+        "created_at": tweet.get("created_at"),
+        "label": thread["annotation"].get("is_rumour", "unknown"),
+        "followers_count": tweet.get("user", {}).get("followers_count"),
+        "friends_count": tweet.get("user", {}).get("friends_count"),
+        "verified": tweet.get("user", {}).get("verified"),
+        "retweet_count": tweet.get("retweet_count"),
+        "favorite_count": tweet.get("favorite_count"),
+        "language": thread["lang"]
+    }
+
+
+def _rumoureval17_original_record(tweet, thread, labels):
+    tweet_id = tweet.get("id_str", tweet.get("id"))
+    return {
+        "id": tweet_id,
+        "text": tweet.get("text"),
+        "created_at": tweet.get("created_at"),
+        "label": labels.get(tweet_id, "unknown"),
+        "name": tweet.get("user", {}).get("name"),
+        "user_followers_count": tweet.get("user", {}).get("followers_count"),
+        "user_friends_count": tweet.get("user", {}).get("friends_count"),
+        "user_verified": tweet.get("user", {}).get("verified"),
+        "retweet_count": tweet.get("retweet_count"),
+        "favorite_count": tweet.get("favorite_count")
+    }
+
+
+def _rumoureval2019_original_record(tweet, thread, labels):
+    tweet_id = tweet.get("id_str", tweet.get("id"))
+    return {
+        "post_id": tweet_id,
+        "post_text": tweet.get("text"),
+        "timestamp": tweet.get("created_at"),
+        "label": labels.get(tweet_id, "unknown"),
+        "username": tweet.get("user", {}).get("name"),
+        "num_followers": tweet.get("user", {}).get("followers_count"),
+        "num_friends": tweet.get("user", {}).get("friends_count"),
+        "is_verified": tweet.get("user", {}).get("verified"),
+        "num_retweets": tweet.get("retweet_count")
+    }
+
+
+def _reply_parent_id(tweet):
+    return tweet.get("in_reply_to_status_id")
+
+
+def _reply_parent_id_str(tweet):
+    return tweet.get("in_reply_to_status_id_str") or tweet.get("in_reply_to_status_id")
+
+
+def _thread_label(thread, parent_id, labels):
+    return thread["label"]
+
+
+def _annotation_label(thread, parent_id, labels):
+    return thread["annotation"].get("is_rumour", "unknown")
+
+
+def _keyed_label(thread, parent_id, labels):
+    return labels.get(str(parent_id), "unknown")
+
+
+# Per dataset: how originals are built, whether every source file or only the
+# first one is used, how a reply points at its parent and how reposts are labelled
+THREAD_LOADERS = {
+    "Pheme5": {
+        "original_record": _pheme_original_record,
+        "all_sources": True,
+        "needs_annotation": False,
+        "labels": None,
+        "parent_id": _reply_parent_id,
+        "repost_label": _thread_label,
+    },
+    "Pheme9": {
+        "original_record": _pheme9_original_record,
+        "all_sources": False,
+        "needs_annotation": True,
+        "labels": None,
+        "parent_id": _reply_parent_id,
+        "repost_label": _annotation_label,
+    },
+    "Pheme-veracity": {
+        "original_record": _pheme_original_record,
+        "all_sources": True,
+        "needs_annotation": False,
+        "labels": None,
+        "parent_id": _reply_parent_id,
+        "repost_label": _thread_label,
+    },
+    "RumorEval17": {
+        "original_record": _rumoureval17_original_record,
+        "all_sources": False,
+        "needs_annotation": False,
+        "labels": _load_rumoureval17_labels,
+        "parent_id": _reply_parent_id,
+        "repost_label": _keyed_label,
+    },
+    "RumorEval19": {
+        "original_record": _rumoureval2019_original_record,
+        "all_sources": False,
+        "needs_annotation": False,
+        "labels": _load_rumoureval2019_labels,
+        "parent_id": _reply_parent_id_str,
+        "repost_label": _keyed_label,
+    },
+}
+
+
+# Threads whose files are read together; bounds how many parsed files are held at once
+THREAD_BATCH_SIZE = 256
+
+
+def _batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def load_thread_dataset(dataset_name, root_path, originals=True, reposts=True):
+    # Walks the thread tree once and returns (originals_df, reposts_df);
+    # either side is None when not requested. The files of each batch of
+    # threads are read on the shared reader pool, and records keep the
+    # walk order.
+    loader = THREAD_LOADERS[dataset_name]
+    labels = loader["labels"](root_path) if loader["labels"] else {}
+
+    original_data = []
+    repost_data = []
+
+    for batch in _batched(iter_threads(root_path, dataset_name), THREAD_BATCH_SIZE):
+        reads = []
+        for thread in batch:
+            if loader["needs_annotation"]:
+                reads.append((thread["annotation_file"], None))
+            if originals:
+                source_files = thread["source_files"] if loader["all_sources"] else thread["source_files"][:1]
+                reads.extend((json_file, TWEET_FIELDS) for json_file in source_files)
+            if reposts:
+                reads.extend((json_file, REPLY_FIELDS) for json_file in thread["reaction_files"])
+
+        results = iter(read_json_items(reads))
+
+        for thread in batch:
+            if loader["needs_annotation"]:
+                # Read the annotation once for both originals and reposts
+                thread["annotation"], error = next(results)
+                if error is not None:
+                    print(f"Error reading annotation in {thread['path']}: {error}")
+                    thread["annotation"] = None
+
+            if originals:
+                source_files = thread["source_files"] if loader["all_sources"] else thread["source_files"][:1]
+                keep = not loader["needs_annotation"] or thread["annotation"] is not None
+                for json_file in source_files:
+                    tweet, error = next(results)
+                    if not keep:
+                        continue
+                    try:
+                        if error is not None:
+                            raise error
+                        original_data.append(loader["original_record"](tweet, thread, labels))
+                    except Exception as e:
+                        print(f"Error reading {json_file}: {e}")
+
+            if reposts:
+                if loader["needs_annotation"] and thread["annotation"] is None:
+                    thread["annotation"] = {}
+
+                for json_file in thread["reaction_files"]:
+                    tweet, error = next(results)
+                    try:
+                        if error is not None:
+                            raise error
+
+                        parent_id = loader["parent_id"](tweet)
+                        if parent_id is None:
+                            continue  # skip if it's not a reply
+
+                        repost_data.append({
+                            "id": str(parent_id),  # original tweet ID
+                            "text": tweet.get("text", ""),
+                            "label": loader["repost_label"](thread, parent_id, labels),
+                        })
+                    except Exception as e:
+                        print(f"Error reading {json_file}: {e}")
+
+    originals_df = pd.DataFrame(original_data) if originals else None
+    reposts_df = pd.DataFrame(repost_data) if reposts else None
+    return originals_df, reposts_df
@@ -0,0 +1,91 @@
+import os
+import pandas as pd
+from utils.json_decoder import fields_spec, iter_json_array
+from utils.run_report import record_file_read
+from utils.parallel_reader import map_ordered
+
+# Keys used from a post: the root post's profile fields and each repost's text
+WEIBO_RUMOR_FIELDS = fields_spec(
+    "id", "text", "original_text", "username", "followers_count", "friends_count",
+    "verified", "reposts_count", "favourites_count",
+)
+
+
+def read_weibo_rumor_events(root_path):
+    # (event_id, label, json_path) per line of Weibo.txt whose event file exists
+    txt_path = os.path.join(root_path, "Weibo.txt")
+    json_dir = os.path.join(root_path, "Weibo")
+
+    events = []
+    record_file_read(txt_path)
+    with open(txt_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            parts = line.strip().split('\t')
+            if len(parts) < 3:
+                continue
+
+            event_id_part = parts[0]  # e.g., "eid:10031080900"
+            label_part = parts[1]     # e.g., "label:0"
+
+            event_id = event_id_part.replace("eid:", "")
+            label = int(label_part.replace("label:", ""))
+
+            json_path = os.path.join(json_dir, f"{event_id}.json")
+            if not os.path.isfile(json_path):
+                continue
+            events.append((event_id, label, json_path))
+    return events
+
+
+def _read_event(item):
+    # One streaming pass over an event file: the first post whose id is the
+    # event id is the root, every other post is a repost of it
+    event_id, json_path, originals, reposts = item
+    root_post = None
+    repost_texts = []
+
+    for post in iter_json_array(json_path, WEIBO_RUMOR_FIELDS):
+        if str(post.get("id")) == event_id:
+            if root_post is None:
+                root_post = post
+        elif reposts:
+            repost_texts.append(post.get("text", ""))
+
+    return (root_post if originals else None), repost_texts
+
+
+def load_weibo_rumor_event_data(root_path, originals=True, reposts=True):
+    # Returns (originals_df, reposts_df) from a single parse of each event
+    # file; either side is None when not requested
+    events = read_weibo_rumor_events(root_path)
+    results = map_ordered(_read_event, [(event_id, json_path, originals, reposts)
+                                        for event_id, _, json_path in events])
+
+    original_records = []
+    repost_records = []
+
+    for (event_id, label, json_path), (event, error) in zip(events, results):
+        if error is not None:
+            print(f"Error reading {json_path}: {error}")
+            continue
+        root_post, repost_texts = event
+
+        if root_post:
+            original_records.append({
+                "id": root_post.get("id"),
+                "original_text": root_post.get("original_text", ""),
+                "username": root_post.get("username", ""),
+                "followers_count": root_post.get("followers_count", 0),
+                "friends_count": root_post.get("friends_count", 0),
+                "verified": root_post.get("verified", False),
+                "reposts_count": root_post.get("reposts_count", 0),
+                "favourites_count": root_post.get("favourites_count", 0),
+                "label": label
+            })
+
+        # Reposts point at the event's root post, which is the original they attach to
+        repost_records.extend({"id": event_id, "text": text, "label": label} for text in repost_texts)
+
+    originals_df = pd.DataFrame(original_records) if originals else None
+    reposts_df = pd.DataFrame(repost_records) if reposts else None
+    return originals_df, reposts_df